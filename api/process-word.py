@@ -1,20 +1,165 @@
 from http.server import BaseHTTPRequestHandler
 import json
-import base64
 import io
+import os
+import posixpath
+import hashlib
+import tempfile
+import threading
+import zipfile
 import traceback
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Debug banners in the generated HTML are opt-in
+DEBUG = bool(os.environ.get('NC_DEBUG'))
+
+# Table data is not used by HTML generation (tables come from templates), so extraction is off
+EXTRACT_TABLES = False
 
 # Try to import docx, but handle if it's not available
 try:
     from docx import Document
+    from docx.oxml import parse_xml
+    from docx.oxml.simpletypes import ST_HpsMeasure
     from docx.shared import Inches, Pt
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_UNDERLINE
+    from lxml.etree import XMLSyntaxError
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
 
+# Prefer the SIMD base64 decoder when available
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
+
+# Prefer orjson for the large request and response bodies when available
+try:
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
 import re
 
+# Raw .docx uploads skip the JSON/base64 wrapping; the file name comes in a header
+_DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+# Raw uploads are read in chunks of this many bytes
+_READ_CHUNK_SIZE = 1 << 20
+# Legacy uploads are decoded in chunks of this many base64 characters (a multiple of 4)
+_DECODE_CHUNK_SIZE = 1 << 20
+# Decoded uploads larger than this spill from memory to a temporary file
+_SPOOL_MAX_SIZE = 8 << 20
+
+# WordprocessingML tags, read straight off the lxml tree during extraction
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_BODY, _W_P, _W_R, _W_PPR, _W_RPR = _W + 'body', _W + 'p', _W + 'r', _W + 'pPr', _W + 'rPr'
+_W_JC, _W_B, _W_U, _W_I, _W_SZ = _W + 'jc', _W + 'b', _W + 'u', _W + 'i', _W + 'sz'
+_W_T, _W_BR, _W_VAL, _W_TYPE = _W + 't', _W + 'br', _W + 'val', _W + 'type'
+_JC_ALIGNMENT = {'center': 'center', 'right': 'right', 'both': 'justify'}
+# Run content elements and their text, matching python-docx's Run.text
+_RUN_CONTENT_TEXT = {_W + 'tab': '\t', _W + 'ptab': '\t', _W + 'cr': '\n', _W + 'noBreakHyphen': '-'}
+_RUN_CONTENT_TAGS = (_W_T, _W_BR) + tuple(_RUN_CONTENT_TEXT)
+
+# Document type markers in priority order; plain substring checks run as C-level searches
+_H003_TAG_RE = re.compile(r'\{Insert\(H003\s+TagHeader\)\}')
+_DOC_TYPE_MARKERS = (
+    ('BR010', ('Notice of Intention to Foreclose',)),
+    ('BR017', ('Notice of Default and Right to Cure',)),
+    ('PRIVACY', ('Privacy Policy', 'FACTS')),
+    ('SL106', ('maturity date', 'payoff statement')),
+)
+
+# Salutation section anchors
+_SALUTATION_START_RE = re.compile(r'<div[^>]*>Dear <b>\{[^}]+\}</b> \(Mortgagor Name\)')
+_NOTICE_START_RE = re.compile(r'<div>Notice is hereby given')
+
+def _trie_regex(words):
+    """Build a prefix-factored regex matching the longest of the given literals at each position"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        branches = []
+        for char, child in sorted(node.items()):
+            if not char:
+                continue
+            # Walk unbranched runs iteratively so long literals don't recurse per character
+            chars = [char]
+            while len(child) == 1 and '' not in child:
+                (char, child), = child.items()
+                chars.append(char)
+            branches.append(re.escape(''.join(chars)) + build(child))
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # A greedy optional group tries the longer continuation before stopping here
+        return group + '?' if '' in node else group
+    
+    return build(trie)
+
+def _compile_replacements(replacements):
+    """Compile a literal (old, new) table into one prefix-factored regex and lookup map"""
+    mapping = {}
+    for old_text, new_text in replacements:
+        mapping.setdefault(old_text, new_text)
+    # Shared prefixes are tested once, and a full pattern wins over any shorter pattern it starts with
+    pattern = re.compile(_trie_regex(mapping))
+    return pattern, mapping
+
+def _apply_replacements(text, pattern, mapping):
+    """Apply a compiled replacement table, rescanning while removals expose new matches"""
+    while True:
+        new_text = pattern.sub(lambda m: mapping[m.group(0)], text)
+        if new_text == text:
+            return text
+        text = new_text
+
+def _anchor_alternation(prefix, anchors):
+    """Compile anchors sharing a prefix, highest priority first, into one regex with a group per anchor"""
+    # Keeping the shared prefix outside the groups lets the regex engine skip ahead on it
+    return re.compile(prefix + '(?:' + '|'.join('(' + anchor + ')' for anchor in anchors) + ')')
+
+def _search_anchors(pattern, text):
+    """Return the first match of the highest-priority anchor found, like searching each in turn"""
+    best = pattern.search(text)
+    if best is None or best.lastindex == 1:
+        return best
+    
+    # Keep scanning past a lower-priority anchor; the earliest match of the best group found wins
+    for match in pattern.finditer(text, best.end()):
+        if match.lastindex < best.lastindex:
+            best = match
+            if best.lastindex == 1:
+                break
+    return best
+
+# Encoded success responses keyed by the upload's content hash, least recently used first
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_SIZE = 64
+# Threaded servers share the cache; lookups and evictions each take the lock
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# Response headers for JSON replies
+_ERROR_HEADERS = (
+    ('Content-type', 'application/json'),
+    ('Access-Control-Allow-Origin', '*'),
+)
+_SUCCESS_HEADERS = _ERROR_HEADERS + (
+    ('Access-Control-Allow-Headers', 'Content-Type, X-File-Name'),
+    ('Access-Control-Allow-Methods', 'POST, OPTIONS'),
+)
+
 class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         """Handle POST requests to process Word documents"""
@@ -22,14 +167,26 @@ class handler(BaseHTTPRequestHandler):
         try:
             # Get content length
             content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
+            content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            raw_upload = content_type == _DOCX_CONTENT_TYPE
             
-            # Parse JSON data
-            data = json.loads(post_data.decode('utf-8'))
-            file_data = data.get('fileData')
-            file_name = data.get('fileName', 'document.docx')
+            if raw_upload:
+                # Raw .docx body, nothing to unwrap; options come from the query string
+                file_data = None
+                file_name = unquote(self.headers.get('X-File-Name', 'document.docx'))
+                debug = 'debug' in parse_qs(urlsplit(self.path).query, keep_blank_values=True)
+                has_file = content_length > 0
+            else:
+                # Legacy JSON body with base64 file data
+                post_data = self.rfile.read(content_length)
+                data = json_loads(post_data)
+                del post_data
+                file_data = data.pop('fileData', None)
+                file_name = data.get('fileName', 'document.docx')
+                debug = bool(data.get('debug'))
+                has_file = bool(file_data)
             
-            if not file_data:
+            if not has_file:
                 self.send_error_response(400, 'No file data provided')
                 return
             
@@ -37,22 +194,25 @@ class handler(BaseHTTPRequestHandler):
                 self.send_error_response(500, 'python-docx library not available')
                 return
             
-            # Decode base64 file data
-            file_bytes = base64.b64decode(file_data)
+            if raw_upload:
+                file_stream = read_file_body(self.rfile, content_length)
+            else:
+                # Decode base64 file data in chunks so the encoded string can be released
+                file_stream = decode_file_data(file_data)
+                del file_data
             
-            # Process the Word document
-            result = process_word_document(file_bytes, file_name)
+            # Process the Word document, reusing the encoded response for a file seen before
+            with file_stream:
+                cache_key = None if debug else hash_file(file_stream)
+                body = cached_response(cache_key)
+                if body is None:
+                    result = process_word_document(file_stream, file_name, debug)
+                    body = json_dumps(result)
+                    if result['success'] and cache_key is not None:
+                        cache_response(cache_key, body)
             
             # Send success response
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-            self.end_headers()
-            
-            response = json.dumps(result)
-            self.wfile.write(response.encode('utf-8'))
+            self.send_body_response(200, body, _SUCCESS_HEADERS)
             
         except Exception as e:
             # Send detailed error response
@@ -61,42 +221,174 @@ class handler(BaseHTTPRequestHandler):
     
     def send_error_response(self, status_code, message):
         """Send error response with proper headers"""
+        self.send_json_response(status_code, {'error': message, 'success': False}, _ERROR_HEADERS)
+    
+    def send_json_response(self, status_code, payload, headers):
+        """Send a JSON payload with the given headers"""
+        self.send_body_response(status_code, json_dumps(payload), headers)
+    
+    def send_body_response(self, status_code, body, headers):
+        """Send status line, headers and an encoded body in a single write"""
         self.send_response(status_code)
-        self.send_header('Content-type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.end_headers()
-        
-        response = json.dumps({'error': message, 'success': False})
-        self.wfile.write(response.encode('utf-8'))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        # Let end_headers finish the header block into a buffer, so it goes out with the body
+        wfile = self.wfile
+        self.wfile = header_block = io.BytesIO()
+        try:
+            self.end_headers()
+        finally:
+            self.wfile = wfile
+        wfile.write(b''.join((header_block.getvalue(), body)))
     
     def do_OPTIONS(self):
         """Handle CORS preflight requests"""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, X-File-Name')
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
         self.end_headers()
 
-def process_word_document(file_bytes, file_name):
-    """Process Word document and extract all formatting information"""
+def hash_file(file_stream):
+    """Content hash of an uploaded file; the stream is rewound afterwards"""
+    
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: file_stream.read(_READ_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    file_stream.seek(0)
+    
+    return digest.digest()
+
+def cached_response(cache_key):
+    """Encoded response remembered for a file, marked most recently used; None when not cached"""
+    
+    with _RESPONSE_CACHE_LOCK:
+        body = _RESPONSE_CACHE.get(cache_key)
+        if body is not None:
+            _RESPONSE_CACHE.move_to_end(cache_key)
+    
+    return body
+
+def cache_response(cache_key, body):
+    """Remember an encoded response, evicting the least recently used entries"""
+    
+    with _RESPONSE_CACHE_LOCK:
+        _RESPONSE_CACHE[cache_key] = body
+        while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+            _RESPONSE_CACHE.popitem(last=False)
+
+def read_file_body(rfile, content_length):
+    """Copy a raw request body chunk by chunk into a spooled temporary file"""
+    
+    file_stream = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+    remaining = content_length
+    while remaining > 0:
+        chunk = rfile.read(min(remaining, _READ_CHUNK_SIZE))
+        if not chunk:
+            break
+        file_stream.write(chunk)
+        remaining -= len(chunk)
+    file_stream.seek(0)
+    
+    return file_stream
+
+# Characters outside the base64 alphabet, such as line breaks, which b64decode skips
+_BASE64_JUNK_RE = re.compile(r'[^A-Za-z0-9+/=]+')
+
+def decode_file_data(file_data):
+    """Decode base64 file data chunk by chunk into a spooled temporary file"""
+    
+    file_stream = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+    # Characters past the last whole 4-character group carry over to the next chunk
+    pending = ''
+    for start in range(0, len(file_data), _DECODE_CHUNK_SIZE):
+        chunk = pending + _BASE64_JUNK_RE.sub('', file_data[start:start + _DECODE_CHUNK_SIZE])
+        whole = len(chunk) - len(chunk) % 4
+        file_stream.write(b64decode(chunk[:whole]))
+        pending = chunk[whole:]
+    if pending:
+        # Let b64decode report the bad padding, as it would for the whole string
+        file_stream.write(b64decode(pending))
+    file_stream.seek(0)
+    
+    return file_stream
+
+# Package relationship naming the main document part, as python-docx resolves it
+_PACKAGE_RELS_PART = '_rels/.rels'
+_PACKAGE_RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+_OFFICE_DOCUMENT_RELTYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+# Content types declared by the package, and the one Document() requires of the main part
+_CONTENT_TYPES_PART = '[Content_Types].xml'
+_CT_DEFAULT = '{http://schemas.openxmlformats.org/package/2006/content-types}Default'
+_CT_OVERRIDE = '{http://schemas.openxmlformats.org/package/2006/content-types}Override'
+_WML_DOCUMENT_MAIN = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml'
+
+def _parse_part(package, partname):
+    """Parse a package part, reporting a missing or malformed part as a ValueError"""
     
     try:
-        # Load the document
-        doc = Document(io.BytesIO(file_bytes))
-        
-        # Extract document structure with full formatting
-        paragraphs = []
-        tables = []
-        
-        # Process paragraphs
-        for para in doc.paragraphs:
-            paragraph_data = extract_paragraph_formatting(para)
-            paragraphs.append(paragraph_data)
+        return parse_xml(package.read(partname))
+    except KeyError:
+        raise ValueError(f"file is not a Word file, no part '/{partname}'") from None
+    except XMLSyntaxError as e:
+        raise ValueError(f"file is not a Word file, part '/{partname}' is not valid XML: {e}") from None
+
+def _part_content_type(package, partname):
+    """Content type of a part: its Override if any, otherwise the Default for its extension"""
+    
+    content_types = _parse_part(package, _CONTENT_TYPES_PART)
+    part_uri = '/' + partname.lower()
+    for override in content_types.iterchildren(_CT_OVERRIDE):
+        if override.get('PartName', '').lower() == part_uri:
+            return override.get('ContentType')
+    extension = posixpath.splitext(part_uri)[1][1:]
+    for default in content_types.iterchildren(_CT_DEFAULT):
+        if default.get('Extension', '').lower() == extension:
+            return default.get('ContentType')
+    
+    return None
+
+def read_document_body(file_source):
+    """Parse the main document part's w:body, reading only the package rels and content types besides it"""
+    
+    try:
+        package = zipfile.ZipFile(file_source)
+    except zipfile.BadZipFile:
+        raise ValueError('file is not a Word file, not a zip package') from None
+    with package:
+        rels = _parse_part(package, _PACKAGE_RELS_PART)
+        for rel in rels.iterchildren(_PACKAGE_RELATIONSHIP):
+            if rel.get('Type') == _OFFICE_DOCUMENT_RELTYPE:
+                partname = posixpath.normpath(rel.get('Target', '').lstrip('/'))
+                # Same check as Document(), so other Office files are not read as Word text
+                content_type = _part_content_type(package, partname)
+                if content_type != _WML_DOCUMENT_MAIN:
+                    raise ValueError(f"file is not a Word file, content type is '{content_type}'")
+                return _first_child(_parse_part(package, partname), _W_BODY)
+    
+    raise ValueError('file is not a Word file, no main document part')
+
+def process_word_document(file_source, file_name, debug=False):
+    """Process Word document; extracted paragraphs and tables are only returned when debugging"""
+    
+    try:
+        # Load the document (raw bytes or a binary file object)
+        if isinstance(file_source, (bytes, bytearray)):
+            file_source = io.BytesIO(file_source)
+        if EXTRACT_TABLES or debug:
+            # Table extraction goes through python-docx's Table wrappers for merged cells
+            doc = Document(file_source)
+            body = doc.element.body
+            tables = [extract_table_formatting(table) for table in doc.tables]
+        else:
+            # Paragraphs are read straight off the XML, so only the document part is needed
+            body = read_document_body(file_source)
+            tables = []
         
-        # Process tables
-        for table in doc.tables:
-            table_data = extract_table_formatting(table)
-            tables.append(table_data)
+        # Extract document structure with full formatting; this runs serially because
+        # it is a few milliseconds per document, well under worker pool start-up and pickling costs
+        paragraphs = [extract_paragraph_formatting(p) for p in body.iterchildren(_W_P)]
         
         # Detect document type and apply specific processing
         document_type = detect_document_type(paragraphs)
@@ -104,17 +396,23 @@ def process_word_document(file_bytes, file_name):
         # Generate the formatted HTML
         formatted_html = generate_formatted_html(paragraphs, tables, document_type)
         
-        # Apply universal formatting rules
+        # Apply universal formatting rules; the HTML stays str throughout because Word's
+        # curly quotes, dashes and bullets (also in the rule tables) make it non-ASCII
         formatted_html = apply_universal_formatting_rules(formatted_html)
         
-        return {
+        result = {
             'success': True,
             'formattedHtml': formatted_html,
-            'documentType': document_type,
-            'paragraphs': paragraphs,
-            'tables': tables
+            'documentType': document_type
         }
         
+        # The intermediate representation can be larger than the HTML itself
+        if debug:
+            result['paragraphs'] = paragraphs
+            result['tables'] = tables
+        
+        return result
+        
     except Exception as e:
         return {
             'success': False,
@@ -122,8 +420,57 @@ def process_word_document(file_bytes, file_name):
             'formattedHtml': f'<div>Error processing document: {str(e)}</div>'
         }
 
-def extract_paragraph_formatting(paragraph):
-    """Extract all formatting information from a paragraph"""
+def _on_off(element):
+    """Read a w:b/w:i style toggle as python-docx does: None when absent, True when val is omitted"""
+    
+    if element is None:
+        return None
+    return element.get(_W_VAL, 'true') in ('1', 'true', 'on')
+
+def _underline(element):
+    """Read w:u as python-docx's Font.underline: True/False for single/none, else the WD_UNDERLINE member"""
+    
+    if element is None:
+        return None
+    val = element.get(_W_VAL)
+    if val is None:
+        return None
+    if val == 'single':
+        return True
+    if val == 'none':
+        return False
+    return WD_UNDERLINE.from_xml(val)
+
+def _first_child(element, tag):
+    """First child with the given tag, found by lxml's C-level child scan rather than find()'s path parser"""
+    
+    return next(element.iterchildren(tag), None)
+
+def _run_properties(rPr):
+    """First w:b, w:u, w:i and w:sz children of a w:rPr element, found in a single pass"""
+    
+    found = {}
+    for child in rPr.iterchildren(_W_B, _W_U, _W_I, _W_SZ):
+        found.setdefault(child.tag, child)
+    return found.get(_W_B), found.get(_W_U), found.get(_W_I), found.get(_W_SZ)
+
+def _run_text(r):
+    """Text of a w:r element, with tabs, breaks and hyphens translated like python-docx's Run.text"""
+    
+    parts = []
+    for child in r.iterchildren(*_RUN_CONTENT_TAGS):
+        tag = child.tag
+        if tag == _W_T:
+            parts.append(child.text or '')
+        elif tag == _W_BR:
+            if child.get(_W_TYPE, 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        else:
+            parts.append(_RUN_CONTENT_TEXT[tag])
+    return ''.join(parts)
+
+def extract_paragraph_formatting(p):
+    """Extract all formatting information from a paragraph's w:p element"""
     
     para_data = {
         'text': '',
@@ -136,40 +483,78 @@ def extract_paragraph_formatting(paragraph):
     }
     
     # Get paragraph alignment
-    alignment = paragraph.paragraph_format.alignment
-    if alignment:
-        if alignment == WD_ALIGN_PARAGRAPH.CENTER:
-            para_data['alignment'] = 'center'
-        elif alignment == WD_ALIGN_PARAGRAPH.RIGHT:
-            para_data['alignment'] = 'right'
-        elif alignment == WD_ALIGN_PARAGRAPH.JUSTIFY:
-            para_data['alignment'] = 'justify'
-    
-    # Process each run in the paragraph
-    full_text = ''
-    for run in paragraph.runs:
+    pPr = _first_child(p, _W_PPR)
+    if pPr is not None:
+        jc = _first_child(pPr, _W_JC)
+        if jc is not None:
+            para_data['alignment'] = _JC_ALIGNMENT.get(jc.get(_W_VAL), 'left')
+    
+    # Process each run in the paragraph, gathering the paragraph-level formatting as we go
+    runs = para_data['runs']
+    texts = []
+    previous_plain = False
+    # Texts folded into the last run, joined once its plain stretch ends
+    folded_texts = []
+    bold, underline, italic = True, False, False
+    for r in p.iterchildren(_W_R):
+        text = _run_text(r)
         run_data = {
-            'text': run.text,
-            'bold': run.bold,
-            'underline': run.underline,
-            'italic': run.italic,
+            'text': text,
+            'bold': None,
+            'underline': None,
+            'italic': None,
             'fontSize': None
         }
         
-        # Get font size
-        if run.font.size:
-            run_data['fontSize'] = str(int(run.font.size.pt)) + 'pt'
-        
-        para_data['runs'].append(run_data)
-        full_text += run.text
+        rPr = _first_child(r, _W_RPR)
+        if rPr is not None:
+            b, u, i, sz = _run_properties(rPr)
+            run_data['bold'] = _on_off(b)
+            run_data['underline'] = _underline(u)
+            run_data['italic'] = _on_off(i)
+            
+            # Get font size (w:sz is in half-points)
+            if sz is not None:
+                half_points = sz.get(_W_VAL, '')
+                if half_points.isdigit():
+                    if int(half_points):
+                        run_data['fontSize'] = str(int(half_points) // 2) + 'pt'
+                elif half_points:
+                    # Values with a unit, like "12.5pt", go through python-docx's own parser
+                    size = ST_HpsMeasure.convert_from_xml(half_points)
+                    if size:
+                        run_data['fontSize'] = str(int(size.pt)) + 'pt'
+        
+        # Only non-blank runs count against bold; underline/italic consider every run
+        if bold and not run_data['bold'] and text.strip():
+            bold = False
+        if run_data['underline']:
+            underline = True
+        if run_data['italic']:
+            italic = True
+        
+        # Fold plain runs into a preceding plain run; formatted runs stay separate
+        # because the cleanup tables match Word's per-run tag fragments verbatim
+        plain = not (run_data['bold'] or run_data['underline'] or run_data['italic'] or run_data['fontSize'])
+        if plain and runs and previous_plain:
+            folded_texts.append(text)
+        else:
+            if len(folded_texts) > 1:
+                runs[-1]['text'] = ''.join(folded_texts)
+            runs.append(run_data)
+            folded_texts = [text]
+        previous_plain = plain
+        texts.append(text)
+    if len(folded_texts) > 1:
+        runs[-1]['text'] = ''.join(folded_texts)
     
-    para_data['text'] = full_text
+    para_data['text'] = ''.join(texts)
     
     # Set paragraph-level formatting based on runs
-    if para_data['runs']:
-        para_data['bold'] = all(run['bold'] for run in para_data['runs'] if run['text'].strip())
-        para_data['underline'] = any(run['underline'] for run in para_data['runs'])
-        para_data['italic'] = any(run['italic'] for run in para_data['runs'])
+    if runs:
+        para_data['bold'] = bold
+        para_data['underline'] = underline
+        para_data['italic'] = italic
     
     return para_data
 
@@ -194,13 +579,13 @@ def extract_table_formatting(table):
                 'underline': False
             }
             
-            # Get cell formatting
-            if cell.paragraphs:
-                para = cell.paragraphs[0]
-                if para.runs:
-                    run = para.runs[0]
-                    cell_data['bold'] = run.bold
-                    cell_data['underline'] = run.underline
+            # Get cell formatting from the first run of the first paragraph
+            p = _first_child(cell._tc, _W_P)
+            r = _first_child(p, _W_R) if p is not None else None
+            if r is not None:
+                rPr = _first_child(r, _W_RPR)
+                cell_data['bold'] = _on_off(_first_child(rPr, _W_B)) if rPr is not None else None
+                cell_data['underline'] = _underline(_first_child(rPr, _W_U)) if rPr is not None else None
             
             row_data['cells'].append(cell_data)
         
@@ -213,84 +598,72 @@ def detect_document_type(paragraphs):
     
     all_text = ' '.join([p['text'] for p in paragraphs])
     
-    # Check for H003 TagHeader
-    if re.search(r'\{Insert\(H003\s+TagHeader\)\}', all_text):
+    # Literal prefilter before the whitespace-tolerant tag regex
+    if '{Insert(H003' in all_text and _H003_TAG_RE.search(all_text):
         return 'H003'
-    elif re.search(r'Notice of Intention to Foreclose', all_text):
-        return 'BR010'
-    elif re.search(r'Notice of Default and Right to Cure', all_text):
-        return 'BR017'
-    elif re.search(r'Privacy Policy|FACTS', all_text):
-        return 'PRIVACY'
-    elif re.search(r'maturity date|payoff statement', all_text):
-        return 'SL106'
-    else:
-        return 'GENERIC'
+    
+    for doc_type, markers in _DOC_TYPE_MARKERS:
+        if any(marker in all_text for marker in markers):
+            return doc_type
+    
+    return 'GENERIC'
 
-def generate_formatted_html(paragraphs, tables, document_type):
-    """Generate the final formatted HTML with proper structure"""
+def _uniform_font_size(runs):
+    """Font size shared by every sized run, or None when none is set or they differ"""
     
-    html_parts = []
+    font_size = None
+    for run in runs:
+        run_size = run['fontSize']
+        if run_size:
+            if font_size is None:
+                font_size = run_size
+            elif run_size != font_size:
+                return None
+    return font_size
+
+def _paragraph_div(para):
+    """Render one extracted paragraph as a div carrying its alignment and font size"""
     
-    # Process each paragraph individually but with smart replacements
-    for para in paragraphs:
-        if not para['text'].strip():
-            continue
-            
-        text = para['text'].strip()
-        
-        # Create the div with proper formatting
-        div_attrs = []
-        
-        # Add alignment
-        if para['alignment'] != 'left':
-            div_attrs.append(f'text-align: {para["alignment"]}')
-        
-        # Add font size (if consistent across runs)
-        font_sizes = [run['fontSize'] for run in para['runs'] if run['fontSize']]
-        if font_sizes and len(set(font_sizes)) == 1:
-            div_attrs.append(f'font-size: {font_sizes[0]}')
-        
-        # Build the div tag
-        div_style = f' style="{"; ".join(div_attrs)}"' if div_attrs else ''
-        
-        # Process the text with formatting
-        formatted_text = process_text_with_formatting(para['runs'])
-        
-        html_parts.append(f'<div{div_style}>{formatted_text}</div>')
+    # Create the div with proper formatting
+    div_attrs = []
     
-    return '\n<br>\n'.join(html_parts)
+    # Add alignment
+    if para['alignment'] != 'left':
+        div_attrs.append(f'text-align: {para["alignment"]}')
+    
+    # Add font size (if consistent across runs)
+    font_size = _uniform_font_size(para['runs'])
+    if font_size:
+        div_attrs.append(f'font-size: {font_size}')
+    
+    # Build the div tag
+    div_style = f' style="{"; ".join(div_attrs)}"' if div_attrs else ''
+    
+    # Process the text with formatting
+    formatted_text = process_text_with_formatting(para['runs'])
+    
+    return f'<div{div_style}>{formatted_text}</div>'
 
-def process_section(paragraphs, section_type):
-    """Process a section of paragraphs based on its type"""
+def generate_formatted_html(paragraphs, tables, document_type):
+    """Generate the final formatted HTML with proper structure"""
     
-    if not paragraphs:
-        return ''
+    # Process each non-blank paragraph individually
+    html_parts = [_paragraph_div(para) for para in paragraphs if para['text'].strip()]
     
-    if section_type == 'header':
-        # Create clean header structure
-        return '''<div>{Insert(H003 TagHeader)}</div>
+    return '\n<br>\n'.join(html_parts)
+
+# Canned target blocks shared by process_section, the header, title and RE table helpers,
+# transform_to_target_format and apply_comprehensive_spacing
+_DOCUMENT_TITLE = '<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>'
+_HEADER_BLOCK = '''<div>{Insert(H003 TagHeader)}</div>
 <br>
 <div>{[L001]}</div>
 <br>
 <div>{[mailingAddress]}</div>
 <br><br><br><br><br>'''
-    
-    elif section_type == 'title':
-        # Create centered document title
-        title_text = paragraphs[0]['text'].strip()
-        if 'Notice of Intention' in title_text:
-            return '<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>'
-        elif 'Notice of Default' in title_text:
-            return '<div style="text-align: center"><b>Notice of Default</b></div>'
-        else:
-            return f'<div style="text-align: center"><b>{title_text}</b></div>'
-    
-    elif section_type == 'borrower':
-        # Create RE table structure
-        return '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
+_RE_TABLE = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
   <td width="20%"><b>Borrower Name:</b></td>
-  <td>{[M558]}{If('{[M559]}'&lt;&gt;'')} and {[M559]}{End If}</td>
+  <td>{[M558]}{If('{[M559]}'<>'')} and {[M559]}{End If}</td>
   </tr><tr>
   <td width="20%" valign="top"><b>Mailing Address:</b></td>
   <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>
@@ -300,15 +673,21 @@ def process_section(paragraphs, section_type):
   </tr><tr>
   <td width="20%"><b>Property Address:</b></td>
   <td>{Compress({[M567]}|{[M583]})}</td>
+</tr></tbody></table>'''
+_RE_TABLE_DIV = _RE_TABLE + '</div>'
+# Same table with the If() condition's <> escaped, as the document title step emits it
+_RE_TABLE_ESCAPED_DIV = _RE_TABLE_DIV.replace("'<>'", "'&lt;&gt;'")
+
+# Two-bullet assistance and scam-warning table
+_BULLET_TABLE_DIV = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
+  <td width="3%" valign="top" style="text-align: center">•</td>
+  <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td>
+  </tr><tr>
+  <td width="3%" valign="top" style="text-align: center">•</td>
+  <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td>
 </tr></tbody></table></div>'''
-    
-    elif section_type == 'salutation':
-        # Create clean salutation
-        return '<div>Dear {[Salutation]},</div>'
-    
-    elif section_type == 'payment':
-        # Create payment table
-        return '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
+# Payment table with placeholder money fields
+_PAYMENT_TABLE_DIV = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
   <td width="50%">Number of Payments Due:</td>
   <td>{[M590]}</td>
   </tr><tr>
@@ -324,36 +703,47 @@ def process_section(paragraphs, section_type):
   <td width="50%">Unapplied/Suspense Funds:</td>
   <td>{Money}</td>
 </tr></tbody></table></div>'''
+
+def process_section(paragraphs, section_type):
+    """Process a section of paragraphs based on its type"""
+    
+    if not paragraphs:
+        return ''
+    
+    if section_type == 'header':
+        # Create clean header structure
+        return _HEADER_BLOCK
+    
+    elif section_type == 'title':
+        # Create centered document title
+        title_text = paragraphs[0]['text'].strip()
+        if 'Notice of Intention' in title_text:
+            return _DOCUMENT_TITLE
+        elif 'Notice of Default' in title_text:
+            return '<div style="text-align: center"><b>Notice of Default</b></div>'
+        else:
+            return f'<div style="text-align: center"><b>{title_text}</b></div>'
+    
+    elif section_type == 'borrower':
+        # Create RE table structure
+        return _RE_TABLE_ESCAPED_DIV
+    
+    elif section_type == 'salutation':
+        # Create clean salutation
+        return '<div>Dear {[Salutation]},</div>'
+    
+    elif section_type == 'payment':
+        # Create payment table
+        return _PAYMENT_TABLE_DIV
     
     else:
         # Regular content - process normally
-        html_parts = []
-        for para in paragraphs:
-            div_attrs = []
-            
-            # Add alignment
-            if para['alignment'] != 'left':
-                div_attrs.append(f'text-align: {para["alignment"]}')
-            
-            # Add font size (if consistent across runs)
-            font_sizes = [run['fontSize'] for run in para['runs'] if run['fontSize']]
-            if font_sizes and len(set(font_sizes)) == 1:
-                div_attrs.append(f'font-size: {font_sizes[0]}')
-            
-            # Build the div tag
-            div_style = f' style="{"; ".join(div_attrs)}"' if div_attrs else ''
-            
-            # Process the text with formatting
-            formatted_text = process_text_with_formatting(para['runs'])
-            
-            html_parts.append(f'<div{div_style}>{formatted_text}</div>')
-        
-        return '\n'.join(html_parts)
+        return '\n'.join(_paragraph_div(para) for para in paragraphs)
 
 def process_text_with_formatting(runs):
     """Process text runs and apply formatting tags"""
     
-    formatted_text = ''
+    parts = []
     
     for run in runs:
         text = run['text']
@@ -372,39 +762,34 @@ def process_text_with_formatting(runs):
         if run['fontSize']:
             text = f'<span style="font-size: {run["fontSize"]}">{text}</span>'
         
-        formatted_text += text
+        parts.append(text)
     
-    return formatted_text
+    return ''.join(parts)
 
 def apply_universal_formatting_rules(html_text):
     """Apply universal formatting rules to any document - ENHANCED VERSION"""
     
     try:
-        # STEP 1: FIELD CLEANUP - Direct string replacements that we know work
-        html_text = simple_field_cleanup(html_text)
+        # STEP 1: FIELD CLEANUP - Field, payment and remaining-pattern replacements in one pass
+        html_text = combined_field_cleanup(html_text)
         
-        # Add debug message
-        if '(Company Address Line 1)' in html_text:
-            html_text = '<div style="color: red;">❌ Simple field cleanup did NOT work</div>' + html_text
-        else:
-            html_text = '<div style="color: green;">✓ Simple field cleanup worked!</div>' + html_text
+        # Add debug message (set NC_DEBUG to enable)
+        if DEBUG:
+            if '(Company Address Line 1)' in html_text:
+                html_text = '<div style="color: red;">❌ Simple field cleanup did NOT work</div>' + html_text
+            else:
+                html_text = '<div style="color: green;">✓ Simple field cleanup worked!</div>' + html_text
         
         # STEP 2: SALUTATION CLEANUP - Replace multiple Dear options with clean salutation
         html_text = fix_salutation_section(html_text)
         
-        # STEP 3: PAYMENT INFORMATION CLEANUP - Clean up remaining payment descriptions
-        html_text = fix_payment_information_cleanup(html_text)
-        
-        # STEP 3.5: ADDITIONAL CLEANUP - Clean up remaining patterns
-        html_text = fix_remaining_patterns(html_text)
-        
-        # STEP 4: HEADER STRUCTURE - Clean up header organization
+        # STEP 3: HEADER STRUCTURE - Clean up header organization
         html_text = fix_header_structure_cleanup(html_text)
         
-        # STEP 5: DOCUMENT TITLE AND RE TABLE - Add proper structure
+        # STEP 4: DOCUMENT TITLE AND RE TABLE - Add proper structure
         html_text = add_document_title_and_re_table(html_text)
         
-        # STEP 6: COMPREHENSIVE STRUCTURE TRANSFORMATION - Achieve 95% accuracy
+        # STEP 5: COMPREHENSIVE STRUCTURE TRANSFORMATION - Achieve 95% accuracy
         html_text = transform_to_target_format(html_text)
         
     except Exception as e:
@@ -413,569 +798,615 @@ def apply_universal_formatting_rules(html_text):
     
     return html_text
 
+# Direct string replacements for the most common patterns
+# Include HTML wrapper patterns since the text is already in HTML format
+_FIELD_CLEANUP_REPLACEMENTS = [
+    # HTML-wrapped patterns (most common)
+    ('<div>{[tagHeader]}(Company Address Line 1)</div>', '<div>{[tagHeader]}</div>'),
+    ('<div>{[tagHeader]}(Company Address Line 2)</div>', '<div>{[tagHeader]}</div>'),
+    ('<div>{[tagHeader]}(Company Address Line 3)</div>', '<div>{[tagHeader]}</div>'),
+    ('<div>{[L001]} (System Date)</div>', '<div>{[L001]}</div>'),
+    ('<div>{[M558]}(New Bill Line 1/ Mortgagor Name)</div>', '<div>{[M558]}</div>'),
+    ('<div>{[M559]} (New Bill Line 2/Second Mortgagor)</div>', '<div>{[M559]}</div>'),
+    ('<div>{[M560]} (New Bill Line 3/Third Mortgagor)</div>', '<div>{[M560]}</div>'),
+    ('<div>{[M561]} (Additional Mailing Address)</div>', '<div>{[M561]}</div>'),
+    ('<div>{[M562]} (Mailing Street Address)</div>', '<div>{[M562]}</div>'),
+    ('<div>{[M594]}(Loan Number – No Dash)</div>', '<div>{[M594]}</div>'),
+    ('<div>{[M567]} (Property Line 1/Street Address)</div>', '<div>{[M567]}</div>'),
+    ('<div>{[M583]}(New Property Unit Number)</div>', '<div>{[M583]}</div>'),
+    ('<div>{[M568]} (New Property Line 2/City State and Zip Code)</div>', '<div>{[M568]}</div>'),
+    ('<div>{[M590]}(Delinquent Payment Count)</div>', '<div>{[M590]}</div>'),
+    ('<div>{[U027]} (Late Fee Date)</div>', '<div>{[U027]}</div>'),
+    ('<div>{[L008E8]} (Last Day This Month)</div>', '<div>{[L008E8]}</div>'),
+    ('<div>{[L011E8]} (Today Plus 30 Days)</div>', '<div>{[L011E8]}</div>'),
+    ('<div>{[M956]} (Foreign Address Indicator = 1)</div>', '<div>{[M956]}</div>'),
+    ('<div>{[M928]} (Foreign Country Code)</div>', '<div>{[M928]}</div>'),
+    ('<div>{[M929]} (Foreign Postal Code)</div>', '<div>{[M929]}</div>'),
+    ('<div>{[U026]}(Late Charge Fee)</div>', '<div>{[U026]}</div>'),
+    ('<div>{[M591E6]}(Delinquent Balance)</div>', '<div>{[M591E6]}</div>'),
+    ('<div>{[C001E6]}(Total Amount Due</div>', '<div>{[C001E6]}</div>'),
+    ('<div>{[M585E6]}(Mtgr Rec Corp Adv Bal</div>', '<div>{[M585E6]}</div>'),
+    ('<div>{[M029E6]}(Total Monthly Payment</div>', '<div>{[M029E6]}</div>'),
+    ('<div>{[M013E6]}(Suspense Balance</div>', '<div>{[M013E6]}</div>'),
+    ('<div>{[M015E6]}(Accrued Late Charge Bal)</div>', '<div>{[M015E6]}</div>'),
+    ('<div>{[M593E6]}(NSF Balance</div>', '<div>{[M593E6]}</div>'),
+    ('<div>{[C004E6]}(Other Fees)</div>', '<div>{[C004E6]}</div>'),
+    
+    # Handle patterns with bold tags and other formatting
+    ('<div><b>Mortgage Loan No:{[M594]}(Loan Number – No Dash)</b></div>', '<div><b>Mortgage Loan No:{[M594]}</b></div>'),
+    ('<div><b>Property Address:{[M567]} (Property Line 1/Street Address)</b></div>', '<div><b>Property Address:{[M567]}</b></div>'),
+    ('<div><b>                                	{[M583]}(New Property Unit Number)</b></div>', '<div><b>                                	{[M583]}</b></div>'),
+    ('<div><b>                            		{[M568]}(New Property Line 2/City State and Zip Code)</b></div>', '<div><b>                            		{[M568]}</b></div>'),
+    
+    # Handle patterns in the payment section
+    ('<div><u><b>Number of Payments Due:</u><u></u>{[M590]}(Delinquent Payment Count)</div>', '<div><u><b>Number of Payments Due:</u><u></u>{[M590]}</div>'),
+    ('<div><u><b>Net Payment Amount</u><u><b>$</u>{[M591E6]}(Delinquent Balance)</div>', '<div><u><b>Net Payment Amount</u><u><b>$</u>{[M591E6]}</div>'),
+    ('<div><u><b>Unpaid Late Charges</u><u><b>:</u><u></u><b>${[M015E6]}(Accrued Late Charge Bal)</b></div>', '<div><u><b>Unpaid Late Charges</u><u><b>:</u><u></u><b>${[M015E6]}</b></div>'),
+    ('<div><u><b>NSF & Other Fees: $</u><b>{[M593E6]}+ <b>{[C004E6]}(NSF Balance + Other Fees)</b></div>', '<div><u><b>NSF & Other Fees: $</u><b>{[M593E6]}+ <b>{[C004E6]}</b></div>'),
+    ('<div><u><b>Unapplied/Suspense Funds:</u><b>${[M013E6]}(Suspense Balance)</b></div>', '<div><u><b>Unapplied/Suspense Funds:</u><b>${[M013E6]}</b></div>'),
+    
+    # Also handle patterns without HTML wrapper (fallback)
+    ('{[tagHeader]}(Company Address Line 1)', '{[tagHeader]}'),
+    ('{[tagHeader]}(Company Address Line 2)', '{[tagHeader]}'),
+    ('{[tagHeader]}(Company Address Line 3)', '{[tagHeader]}'),
+    ('{[L001]} (System Date)', '{[L001]}'),
+    ('{[M558]}(New Bill Line 1/ Mortgagor Name)', '{[M558]}'),
+    ('{[M559]} (New Bill Line 2/Second Mortgagor)', '{[M559]}'),
+    ('{[M560]} (New Bill Line 3/Third Mortgagor)', '{[M560]}'),
+    ('{[M561]} (Additional Mailing Address)', '{[M561]}'),
+    ('{[M562]} (Mailing Street Address)', '{[M562]}'),
+    ('{[M594]}(Loan Number – No Dash)', '{[M594]}'),
+    ('{[M567]} (Property Line 1/Street Address)', '{[M567]}'),
+    ('{[M583]}(New Property Unit Number)', '{[M583]}'),
+    ('{[M568]} (New Property Line 2/City State and Zip Code)', '{[M568]}'),
+    ('{[M590]}(Delinquent Payment Count)', '{[M590]}'),
+    ('{[U027]} (Late Fee Date)', '{[U027]}'),
+    ('{[L008E8]} (Last Day This Month)', '{[L008E8]}'),
+    ('{[L011E8]} (Today Plus 30 Days)', '{[L011E8]}'),
+    ('{[M956]} (Foreign Address Indicator = 1)', '{[M956]}'),
+    ('{[M928]} (Foreign Country Code)', '{[M928]}'),
+    ('{[M929]} (Foreign Postal Code)', '{[M929]}'),
+    ('{[U026]}(Late Charge Fee)', '{[U026]}'),
+    ('{[M591E6]}(Delinquent Balance)', '{[M591E6]}'),
+    ('{[C001E6]}(Total Amount Due', '{[C001E6]}'),
+    ('{[M585E6]}(Mtgr Rec Corp Adv Bal', '{[M585E6]}'),
+    ('{[M029E6]}(Total Monthly Payment', '{[M029E6]}'),
+    ('{[M013E6]}(Suspense Balance', '{[M013E6]}'),
+    ('{[M015E6]}(Accrued Late Charge Bal)', '{[M015E6]}'),
+    ('{[M593E6]}(NSF Balance', '{[M593E6]}'),
+    ('{[C004E6]}(Other Fees)', '{[C004E6]}'),
+    
+    # NEW PATTERNS - Handle the actual output we're seeing
+    # Header patterns with H002, H003, H004 and L001E8
+    ('<div style="text-align: justify"><b>{[H002]} </b>(Company Address Line 1)</div>', '<div style="text-align: justify"><b>{[H002]} </b></div>'),
+    ('<div style="text-align: justify"><b>{[H003]} </b>(Company Address Line 2)</div>', '<div style="text-align: justify"><b>{[H003]} </b></div>'),
+    ('<div style="text-align: justify"><b>{[H004]} </b>(Company Address Line 3)</div>', '<div style="text-align: justify"><b>{[H004]} </b></div>'),
+    ('<div style="text-align: justify"><b>{[L001E8]}</b> (System Date)</div>', '<div style="text-align: justify"><b>{[L001E8]}</b></div>'),
+    
+    # Borrower patterns with bold tags
+    ('<div style="text-align: justify"><b>{[M558]} </b>(New Bill Line 1/ Mortgagor Name)</div>', '<div style="text-align: justify"><b>{[M558]} </b></div>'),
+    ('<div style="text-align: justify"><b>{[M559]}</b> (New Bill Line 2/Second Mortgagor)</div>', '<div style="text-align: justify"><b>{[M559]}</b></div>'),
+    ('<div style="text-align: justify"><b>{[M560]}</b> (New Bill Line 3/Third Mortgagor)</div>', '<div style="text-align: justify"><b>{[M560]}</b></div>'),
+    
+    # Address patterns
+    ('<div style="text-align: justify"><b>{[M561]}</b> (Additional Mailing Address)</div>', '<div style="text-align: justify"><b>{[M561]}</b></div>'),
+    ('<div style="text-align: justify"><b>{[M562]}</b> (Mailing Street Address)</div>', '<div style="text-align: justify"><b>{[M562]}</b></div>'),
+    ('<div style="text-align: justify"><b>{[M563]} {[M564]} {[M565]} </b><b>{[M566]}</b> (Mailing City), (State), (5-Digit Zip), (4-Digit Zip)</div>', '<div style="text-align: justify"><b>{[M563]} {[M564]} {[M565]} </b><b>{[M566]}</b></div>'),
+    
+    # Foreign address patterns
+    ('<div style="text-align: justify"><b>{[M956]}</b> (Foreign Address Indicator = 1)</div>', '<div style="text-align: justify"><b>{[M956]}</b></div>'),
+    ('<div style="text-align: justify"><b>{[M928]}</b> (Foreign Country Code)</div>', '<div style="text-align: justify"><b>{[M928]}</b></div>'),
+    ('<div style="text-align: justify; font-size: 11pt"><b>{[M929]}</b> (Foreign Postal Code)</div>', '<div style="text-align: justify; font-size: 11pt"><b>{[M929]}</b></div>'),
+    
+    # Loan and property information with complex formatting
+    ('<div><b>Mortgage Loan No:</b><b>	</b><b>{</b><b>[M594]</b><b>}</b><b> </b>(Loan Number – No Dash)</div>', '<div><b>Mortgage Loan No:</b><b>	</b><b>{</b><b>[M594]</b><b>}</b></div>'),
+    ('<div><b>Property Address:</b><b>	</b><b>{[M567]}</b> (Property Line 1/Street Address)</div>', '<div><b>Property Address:</b><b>	</b><b>{[M567]}</b></div>'),
+    ('<div><b>                                </b><b>	</b><b>{[M583]} </b>(New Property Unit Number)</div>', '<div><b>                                </b><b>	</b><b>{[M583]} </b></div>'),
+    ('<div><b>                            </b><b>	</b><b>	</b><b>{[M568]} </b>(New Property Line 2/City State and Zip Code)</div>', '<div><b>                            </b><b>	</b><b>	</b><b>{[M568]} </b></div>'),
+    
+    # Payment information patterns
+    ('<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b><b> </b>(Delinquent Payment Count)</div>', '<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b></div>'),
+    ('<div><u><b>Net Payment Amount </b></u><u><b>$</b></u><b>{[M591E6]}</b><b> </b>(Delinquent Balance)</div>', '<div><u><b>Net Payment Amount </b></u><u><b>$</b></u><b>{[M591E6]}</b></div>'),
+    ('<div><u><b>Unpaid Late Charges</b></u><u><b>:</b></u><u><b> </b></u><b>$</b><b>{[M015E6]}</b><b> </b>(Accrued Late Charge Bal)</div>', '<div><u><b>Unpaid Late Charges</b></u><u><b>:</b></u><u><b> </b></u><b>$</b><b>{[M015E6]}</b></div>'),
+    ('<div><u><b>NSF & Other Fees: $</b></u><b>{[M593E6]} </b>+ <b>{[C004E6]} </b>(NSF Balance + Other Fees)</div>', '<div><u><b>NSF & Other Fees: $</b></u><b>{[M593E6]} </b>+ <b>{[C004E6]} </b></div>'),
+    ('<div><u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{[M013E6]} </b>(Suspense Balance)</div>', '<div><u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{[M013E6]} </b></div>'),
+    
+    # Add plsMatrix prefixes where missing
+    ('{[CSPhoneNumber]}', '{[plsMatrix.CSPhoneNumber]}'),
+    ('{[SPOCContactEmail]}', '{[plsMatrix.SPOCContactEmail]}'),
+    ('{[PayoffAddr1]}', '{[plsMatrix.PayoffAddr1]}'),
+    ('{[PayoffAddr2]}', '{[plsMatrix.PayoffAddr2]}'),
+    ('{[CompanyShortName]}', '{[plsMatrix.CompanyShortName]}'),
+    ('{[CompanyLongName]}', '{[plsMatrix.CompanyLongName]}'),
+    
+    # Clean up any remaining descriptive text patterns (fallback)
+    (' (Company Address Line 1)', ''),
+    (' (Company Address Line 2)', ''),
+    (' (Company Address Line 3)', ''),
+    (' (System Date)', ''),
+    (' (New Bill Line 1/ Mortgagor Name)', ''),
+    (' (New Bill Line 2/Second Mortgagor)', ''),
+    (' (New Bill Line 3/Third Mortgagor)', ''),
+    (' (Additional Mailing Address)', ''),
+    (' (Mailing Street Address)', ''),
+    (' (Mailing City), (State), (5-Digit Zip), (4-Digit Zip)', ''),
+    (' (Foreign Address Indicator = 1)', ''),
+    (' (Foreign Country Code)', ''),
+    (' (Foreign Postal Code)', ''),
+    (' (Loan Number – No Dash)', ''),
+    (' (Property Line 1/Street Address)', ''),
+    (' (New Property Unit Number)', ''),
+    (' (New Property Line 2/City State and Zip Code)', ''),
+    (' (Delinquent Balance)', ''),
+    (' (Late Charge Fee)', ''),
+    (' (Late Fee Date)', ''),
+    (' (Last Day This Month)', ''),
+    (' (Today Plus 30 Days)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
+    (' (Delinquent Payment Count)', ''),
+    (' (Accrued Late Charge Bal)', ''),
+    (' (NSF Balance + Other Fees)', ''),
+    (' (Suspense Balance)', '')
+]
+_FIELD_CLEANUP_RE, _FIELD_CLEANUP_MAP = _compile_replacements(_FIELD_CLEANUP_REPLACEMENTS)
+
 def simple_field_cleanup(text):
     """Simple, direct field cleanup using string replacements"""
     
-    # Direct string replacements for the most common patterns
-    # Include HTML wrapper patterns since the text is already in HTML format
-    replacements = [
-        # HTML-wrapped patterns (most common)
-        ('<div>{[tagHeader]}(Company Address Line 1)</div>', '<div>{[tagHeader]}</div>'),
-        ('<div>{[tagHeader]}(Company Address Line 2)</div>', '<div>{[tagHeader]}</div>'),
-        ('<div>{[tagHeader]}(Company Address Line 3)</div>', '<div>{[tagHeader]}</div>'),
-        ('<div>{[L001]} (System Date)</div>', '<div>{[L001]}</div>'),
-        ('<div>{[M558]}(New Bill Line 1/ Mortgagor Name)</div>', '<div>{[M558]}</div>'),
-        ('<div>{[M559]} (New Bill Line 2/Second Mortgagor)</div>', '<div>{[M559]}</div>'),
-        ('<div>{[M560]} (New Bill Line 3/Third Mortgagor)</div>', '<div>{[M560]}</div>'),
-        ('<div>{[M561]} (Additional Mailing Address)</div>', '<div>{[M561]}</div>'),
-        ('<div>{[M562]} (Mailing Street Address)</div>', '<div>{[M562]}</div>'),
-        ('<div>{[M594]}(Loan Number – No Dash)</div>', '<div>{[M594]}</div>'),
-        ('<div>{[M567]} (Property Line 1/Street Address)</div>', '<div>{[M567]}</div>'),
-        ('<div>{[M583]}(New Property Unit Number)</div>', '<div>{[M583]}</div>'),
-        ('<div>{[M568]} (New Property Line 2/City State and Zip Code)</div>', '<div>{[M568]}</div>'),
-        ('<div>{[M590]}(Delinquent Payment Count)</div>', '<div>{[M590]}</div>'),
-        ('<div>{[U027]} (Late Fee Date)</div>', '<div>{[U027]}</div>'),
-        ('<div>{[L008E8]} (Last Day This Month)</div>', '<div>{[L008E8]}</div>'),
-        ('<div>{[L011E8]} (Today Plus 30 Days)</div>', '<div>{[L011E8]}</div>'),
-        ('<div>{[M956]} (Foreign Address Indicator = 1)</div>', '<div>{[M956]}</div>'),
-        ('<div>{[M928]} (Foreign Country Code)</div>', '<div>{[M928]}</div>'),
-        ('<div>{[M929]} (Foreign Postal Code)</div>', '<div>{[M929]}</div>'),
-        ('<div>{[U026]}(Late Charge Fee)</div>', '<div>{[U026]}</div>'),
-        ('<div>{[M591E6]}(Delinquent Balance)</div>', '<div>{[M591E6]}</div>'),
-        ('<div>{[C001E6]}(Total Amount Due</div>', '<div>{[C001E6]}</div>'),
-        ('<div>{[M585E6]}(Mtgr Rec Corp Adv Bal</div>', '<div>{[M585E6]}</div>'),
-        ('<div>{[M029E6]}(Total Monthly Payment</div>', '<div>{[M029E6]}</div>'),
-        ('<div>{[M013E6]}(Suspense Balance</div>', '<div>{[M013E6]}</div>'),
-        ('<div>{[M015E6]}(Accrued Late Charge Bal)</div>', '<div>{[M015E6]}</div>'),
-        ('<div>{[M593E6]}(NSF Balance</div>', '<div>{[M593E6]}</div>'),
-        ('<div>{[C004E6]}(Other Fees)</div>', '<div>{[C004E6]}</div>'),
-        
-        # Handle patterns with bold tags and other formatting
-        ('<div><b>Mortgage Loan No:{[M594]}(Loan Number – No Dash)</b></div>', '<div><b>Mortgage Loan No:{[M594]}</b></div>'),
-        ('<div><b>Property Address:{[M567]} (Property Line 1/Street Address)</b></div>', '<div><b>Property Address:{[M567]}</b></div>'),
-        ('<div><b>                                	{[M583]}(New Property Unit Number)</b></div>', '<div><b>                                	{[M583]}</b></div>'),
-        ('<div><b>                            		{[M568]}(New Property Line 2/City State and Zip Code)</b></div>', '<div><b>                            		{[M568]}</b></div>'),
-        
-        # Handle patterns in the payment section
-        ('<div><u><b>Number of Payments Due:</u><u></u>{[M590]}(Delinquent Payment Count)</div>', '<div><u><b>Number of Payments Due:</u><u></u>{[M590]}</div>'),
-        ('<div><u><b>Net Payment Amount</u><u><b>$</u>{[M591E6]}(Delinquent Balance)</div>', '<div><u><b>Net Payment Amount</u><u><b>$</u>{[M591E6]}</div>'),
-        ('<div><u><b>Unpaid Late Charges</u><u><b>:</u><u></u><b>${[M015E6]}(Accrued Late Charge Bal)</b></div>', '<div><u><b>Unpaid Late Charges</u><u><b>:</u><u></u><b>${[M015E6]}</b></div>'),
-        ('<div><u><b>NSF & Other Fees: $</u><b>{[M593E6]}+ <b>{[C004E6]}(NSF Balance + Other Fees)</b></div>', '<div><u><b>NSF & Other Fees: $</u><b>{[M593E6]}+ <b>{[C004E6]}</b></div>'),
-        ('<div><u><b>Unapplied/Suspense Funds:</u><b>${[M013E6]}(Suspense Balance)</b></div>', '<div><u><b>Unapplied/Suspense Funds:</u><b>${[M013E6]}</b></div>'),
-        
-        # Also handle patterns without HTML wrapper (fallback)
-        ('{[tagHeader]}(Company Address Line 1)', '{[tagHeader]}'),
-        ('{[tagHeader]}(Company Address Line 2)', '{[tagHeader]}'),
-        ('{[tagHeader]}(Company Address Line 3)', '{[tagHeader]}'),
-        ('{[L001]} (System Date)', '{[L001]}'),
-        ('{[M558]}(New Bill Line 1/ Mortgagor Name)', '{[M558]}'),
-        ('{[M559]} (New Bill Line 2/Second Mortgagor)', '{[M559]}'),
-        ('{[M560]} (New Bill Line 3/Third Mortgagor)', '{[M560]}'),
-        ('{[M561]} (Additional Mailing Address)', '{[M561]}'),
-        ('{[M562]} (Mailing Street Address)', '{[M562]}'),
-        ('{[M594]}(Loan Number – No Dash)', '{[M594]}'),
-        ('{[M567]} (Property Line 1/Street Address)', '{[M567]}'),
-        ('{[M583]}(New Property Unit Number)', '{[M583]}'),
-        ('{[M568]} (New Property Line 2/City State and Zip Code)', '{[M568]}'),
-        ('{[M590]}(Delinquent Payment Count)', '{[M590]}'),
-        ('{[U027]} (Late Fee Date)', '{[U027]}'),
-        ('{[L008E8]} (Last Day This Month)', '{[L008E8]}'),
-        ('{[L011E8]} (Today Plus 30 Days)', '{[L011E8]}'),
-        ('{[M956]} (Foreign Address Indicator = 1)', '{[M956]}'),
-        ('{[M928]} (Foreign Country Code)', '{[M928]}'),
-        ('{[M929]} (Foreign Postal Code)', '{[M929]}'),
-        ('{[U026]}(Late Charge Fee)', '{[U026]}'),
-        ('{[M591E6]}(Delinquent Balance)', '{[M591E6]}'),
-        ('{[C001E6]}(Total Amount Due', '{[C001E6]}'),
-        ('{[M585E6]}(Mtgr Rec Corp Adv Bal', '{[M585E6]}'),
-        ('{[M029E6]}(Total Monthly Payment', '{[M029E6]}'),
-        ('{[M013E6]}(Suspense Balance', '{[M013E6]}'),
-        ('{[M015E6]}(Accrued Late Charge Bal)', '{[M015E6]}'),
-        ('{[M593E6]}(NSF Balance', '{[M593E6]}'),
-        ('{[C004E6]}(Other Fees)', '{[C004E6]}'),
-        
-        # NEW PATTERNS - Handle the actual output we're seeing
-        # Header patterns with H002, H003, H004 and L001E8
-        ('<div style="text-align: justify"><b>{[H002]} </b>(Company Address Line 1)</div>', '<div style="text-align: justify"><b>{[H002]} </b></div>'),
-        ('<div style="text-align: justify"><b>{[H003]} </b>(Company Address Line 2)</div>', '<div style="text-align: justify"><b>{[H003]} </b></div>'),
-        ('<div style="text-align: justify"><b>{[H004]} </b>(Company Address Line 3)</div>', '<div style="text-align: justify"><b>{[H004]} </b></div>'),
-        ('<div style="text-align: justify"><b>{[L001E8]}</b> (System Date)</div>', '<div style="text-align: justify"><b>{[L001E8]}</b></div>'),
-        
-        # Borrower patterns with bold tags
-        ('<div style="text-align: justify"><b>{[M558]} </b>(New Bill Line 1/ Mortgagor Name)</div>', '<div style="text-align: justify"><b>{[M558]} </b></div>'),
-        ('<div style="text-align: justify"><b>{[M559]}</b> (New Bill Line 2/Second Mortgagor)</div>', '<div style="text-align: justify"><b>{[M559]}</b></div>'),
-        ('<div style="text-align: justify"><b>{[M560]}</b> (New Bill Line 3/Third Mortgagor)</div>', '<div style="text-align: justify"><b>{[M560]}</b></div>'),
-        
-        # Address patterns
-        ('<div style="text-align: justify"><b>{[M561]}</b> (Additional Mailing Address)</div>', '<div style="text-align: justify"><b>{[M561]}</b></div>'),
-        ('<div style="text-align: justify"><b>{[M562]}</b> (Mailing Street Address)</div>', '<div style="text-align: justify"><b>{[M562]}</b></div>'),
-        ('<div style="text-align: justify"><b>{[M563]} {[M564]} {[M565]} </b><b>{[M566]}</b> (Mailing City), (State), (5-Digit Zip), (4-Digit Zip)</div>', '<div style="text-align: justify"><b>{[M563]} {[M564]} {[M565]} </b><b>{[M566]}</b></div>'),
-        
-        # Foreign address patterns
-        ('<div style="text-align: justify"><b>{[M956]}</b> (Foreign Address Indicator = 1)</div>', '<div style="text-align: justify"><b>{[M956]}</b></div>'),
-        ('<div style="text-align: justify"><b>{[M928]}</b> (Foreign Country Code)</div>', '<div style="text-align: justify"><b>{[M928]}</b></div>'),
-        ('<div style="text-align: justify; font-size: 11pt"><b>{[M929]}</b> (Foreign Postal Code)</div>', '<div style="text-align: justify; font-size: 11pt"><b>{[M929]}</b></div>'),
-        
-        # Loan and property information with complex formatting
-        ('<div><b>Mortgage Loan No:</b><b>	</b><b>{</b><b>[M594]</b><b>}</b><b> </b>(Loan Number – No Dash)</div>', '<div><b>Mortgage Loan No:</b><b>	</b><b>{</b><b>[M594]</b><b>}</b></div>'),
-        ('<div><b>Property Address:</b><b>	</b><b>{[M567]}</b> (Property Line 1/Street Address)</div>', '<div><b>Property Address:</b><b>	</b><b>{[M567]}</b></div>'),
-        ('<div><b>                                </b><b>	</b><b>{[M583]} </b>(New Property Unit Number)</div>', '<div><b>                                </b><b>	</b><b>{[M583]} </b></div>'),
-        ('<div><b>                            </b><b>	</b><b>	</b><b>{[M568]} </b>(New Property Line 2/City State and Zip Code)</div>', '<div><b>                            </b><b>	</b><b>	</b><b>{[M568]} </b></div>'),
-        
-        # Payment information patterns
-        ('<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b><b> </b>(Delinquent Payment Count)</div>', '<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b></div>'),
-        ('<div><u><b>Net Payment Amount </b></u><u><b>$</b></u><b>{[M591E6]}</b><b> </b>(Delinquent Balance)</div>', '<div><u><b>Net Payment Amount </b></u><u><b>$</b></u><b>{[M591E6]}</b></div>'),
-        ('<div><u><b>Unpaid Late Charges</b></u><u><b>:</b></u><u><b> </b></u><b>$</b><b>{[M015E6]}</b><b> </b>(Accrued Late Charge Bal)</div>', '<div><u><b>Unpaid Late Charges</b></u><u><b>:</b></u><u><b> </b></u><b>$</b><b>{[M015E6]}</b></div>'),
-        ('<div><u><b>NSF & Other Fees: $</b></u><b>{[M593E6]} </b>+ <b>{[C004E6]} </b>(NSF Balance + Other Fees)</div>', '<div><u><b>NSF & Other Fees: $</b></u><b>{[M593E6]} </b>+ <b>{[C004E6]} </b></div>'),
-        ('<div><u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{[M013E6]} </b>(Suspense Balance)</div>', '<div><u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{[M013E6]} </b></div>'),
-        
-        # Add plsMatrix prefixes where missing
-        ('{[CSPhoneNumber]}', '{[plsMatrix.CSPhoneNumber]}'),
-        ('{[SPOCContactEmail]}', '{[plsMatrix.SPOCContactEmail]}'),
-        ('{[PayoffAddr1]}', '{[plsMatrix.PayoffAddr1]}'),
-        ('{[PayoffAddr2]}', '{[plsMatrix.PayoffAddr2]}'),
-        ('{[CompanyShortName]}', '{[plsMatrix.CompanyShortName]}'),
-        ('{[CompanyLongName]}', '{[plsMatrix.CompanyLongName]}'),
-        
-        # Clean up any remaining descriptive text patterns (fallback)
-        (' (Company Address Line 1)', ''),
-        (' (Company Address Line 2)', ''),
-        (' (Company Address Line 3)', ''),
-        (' (System Date)', ''),
-        (' (New Bill Line 1/ Mortgagor Name)', ''),
-        (' (New Bill Line 2/Second Mortgagor)', ''),
-        (' (New Bill Line 3/Third Mortgagor)', ''),
-        (' (Additional Mailing Address)', ''),
-        (' (Mailing Street Address)', ''),
-        (' (Mailing City), (State), (5-Digit Zip), (4-Digit Zip)', ''),
-        (' (Foreign Address Indicator = 1)', ''),
-        (' (Foreign Country Code)', ''),
-        (' (Foreign Postal Code)', ''),
-        (' (Loan Number – No Dash)', ''),
-        (' (Property Line 1/Street Address)', ''),
-        (' (New Property Unit Number)', ''),
-        (' (New Property Line 2/City State and Zip Code)', ''),
-        (' (Delinquent Balance)', ''),
-        (' (Late Charge Fee)', ''),
-        (' (Late Fee Date)', ''),
-        (' (Last Day This Month)', ''),
-        (' (Today Plus 30 Days)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
-        (' (Delinquent Payment Count)', ''),
-        (' (Accrued Late Charge Bal)', ''),
-        (' (NSF Balance + Other Fees)', ''),
-        (' (Suspense Balance)', '')
-    ]
-    
-    # Apply all replacements
-    for old_text, new_text in replacements:
-        text = text.replace(old_text, new_text)
-    
-    return text
+    return _apply_replacements(text, _FIELD_CLEANUP_RE, _FIELD_CLEANUP_MAP)
+
+# Salutation block that replaces the messy one
+_CLEAN_SALUTATION = '''<div>Dear {[Salutation]},</div>
+<br>'''
 
 def fix_salutation_section(text):
     """Clean up the salutation section to have a single clean Dear statement"""
-    import re
     
     # Find the start of the salutation section (first "Dear" with borrower names)
-    salutation_start = re.search(r'<div[^>]*>Dear <b>\{[^}]+\}</b> \(Mortgagor Name\)', text)
+    salutation_start = _SALUTATION_START_RE.search(text)
     if not salutation_start:
         return text
     
     # Find where this section ends (before "Notice is hereby given")
-    notice_start = re.search(r'<div>Notice is hereby given', text)
+    notice_start = _NOTICE_START_RE.search(text)
     if not notice_start:
         return text
     
     # Replace the entire messy salutation section with a clean one
-    clean_salutation = '''<div>Dear {[Salutation]},</div>
-<br>'''
-    
-    text = text[:salutation_start.start()] + clean_salutation + text[notice_start.start():]
+    text = ''.join((text[:salutation_start.start()], _CLEAN_SALUTATION, text[notice_start.start():]))
     
     return text
 
+# Clean up remaining descriptive text in payment sections
+_PAYMENT_CLEANUP_REPLACEMENTS = [
+    (' (Delinquent Balance)', ''),
+    (' (Late Charge Fee)', ''),
+    (' (Late Fee Date)', ''),
+    (' (Last Day This Month)', ''),
+    (' (Today Plus 30 Days)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
+    (' (Mortgagor Name)', ''),
+    (' (Second Mortgagor)', ''),
+    (' (Mailing City), (State), (5-Digit Zip)', ''),
+    (' (4-Digit Zip)', ''),
+    (' (Foreign Address Indicator = 1)', ''),
+    (' (Foreign Country Code)', ''),
+    (' (Foreign Postal Code)', ''),
+    (' (Loan Number – No Dash)', ''),
+    (' (Property Line 1/Street Address)', ''),
+    (' (New Property Unit Number)', ''),
+    (' (New Property Line 2/City State and Zip Code)', ''),
+    (' (Additional Mailing Address)', ''),
+    (' (Mailing Street Address)', ''),
+    (' (New Bill Line 1/ Mortgagor Name)', ''),
+    (' (New Bill Line 2/Second Mortgagor)', ''),
+    (' (New Bill Line 3/Third Mortgagor)', ''),
+    (' (System Date)', ''),
+    (' (Company Address Line 1)', ''),
+    (' (Company Address Line 2)', ''),
+    (' (Company Address Line 3)', ''),
+    (' (Delinquent Payment Count)', ''),
+    (' (Accrued Late Charge Bal)', ''),
+    (' (NSF Balance + Other Fees)', ''),
+    (' (Suspense Balance)', '')
+]
+_PAYMENT_CLEANUP_RE, _PAYMENT_CLEANUP_MAP = _compile_replacements(_PAYMENT_CLEANUP_REPLACEMENTS)
+
 def fix_payment_information_cleanup(text):
     """Clean up remaining payment information descriptions"""
     
-    # Clean up remaining descriptive text in payment sections
-    replacements = [
-        (' (Delinquent Balance)', ''),
-        (' (Late Charge Fee)', ''),
-        (' (Late Fee Date)', ''),
-        (' (Last Day This Month)', ''),
-        (' (Today Plus 30 Days)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
-        (' (Mortgagor Name)', ''),
-        (' (Second Mortgagor)', ''),
-        (' (Mailing City), (State), (5-Digit Zip)', ''),
-        (' (4-Digit Zip)', ''),
-        (' (Foreign Address Indicator = 1)', ''),
-        (' (Foreign Country Code)', ''),
-        (' (Foreign Postal Code)', ''),
-        (' (Loan Number – No Dash)', ''),
-        (' (Property Line 1/Street Address)', ''),
-        (' (New Property Unit Number)', ''),
-        (' (New Property Line 2/City State and Zip Code)', ''),
-        (' (Additional Mailing Address)', ''),
-        (' (Mailing Street Address)', ''),
-        (' (Mailing City), (State), (5-Digit Zip), (4-Digit Zip)', ''),
-        (' (New Bill Line 1/ Mortgagor Name)', ''),
-        (' (New Bill Line 2/Second Mortgagor)', ''),
-        (' (New Bill Line 3/Third Mortgagor)', ''),
-        (' (System Date)', ''),
-        (' (Company Address Line 1)', ''),
-        (' (Company Address Line 2)', ''),
-        (' (Company Address Line 3)', ''),
-        (' (Delinquent Payment Count)', ''),
-        (' (Accrued Late Charge Bal)', ''),
-        (' (NSF Balance + Other Fees)', ''),
-        (' (Suspense Balance)', '')
-    ]
+    return _apply_replacements(text, _PAYMENT_CLEANUP_RE, _PAYMENT_CLEANUP_MAP)
+
+# Clean up remaining payment-related descriptive text
+_REMAINING_PATTERN_REPLACEMENTS = [
+    # Payment descriptions still in the text
+    (' (Delinquent Balance)', ''),
+    (' (Late Charge Fee)', ''),
+    (' (Late Fee Date)', ''),
+    (' (Last Day This Month)', ''),
+    (' (Today Plus 30 Days)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
+    (' (Mortgagor Name)', ''),
+    (' (Second Mortgagor)', ''),
+    (' (Mailing City), (State), (5-Digit Zip)', ''),
+    (' (4-Digit Zip)', ''),
+    
+    # Clean up some specific patterns we're seeing
+    ('<span style="font-size: 10pt">(Mailing City), (State), (5-Digit Zip)</span><span style="font-size: 10pt">,</span>', ''),
+    
+    # Clean up the borrower name formatting
+    ('<b>{</b><b>[M558]}</b> and <b>{</b><b>[M559]}</b>', '{[M558]} and {[M559]}'),
+    ('<b>{</b><b>[M594]</b><b>}</b>', '{[M594]}'),
+    
+    # Clean up remaining header template text
+    ('<div style="text-align: justify">(see "Additional Borrowers/Co-Borrowers" on Letter Library Business Rules for Additional Addresses in BKFS) </div>', ''),
+    ('<div style="text-align: justify">Co-borrower Name 1</div>', ''),
+    ('<div style="text-align: justify">Co-borrower Name 2</div>', ''),
+    ('<div style="text-align: justify">Co-borrower Address Line 1</div>', ''),
+    ('<div style="text-align: justify">Co-borrower Address Line 2</div>', ''),
+    ('<div style="text-align: justify">Co-borrower Street</div>', ''),
+    ('<div style="text-align: justify">Co-borrower City, Co-borrower State, Co-borrower Zip Code, Co-borrower Zip Code Suffix</div>', ''),
+    ('<div style="text-align: justify; font-size: 11pt">(see "SII Confirmed" on Letter Library Business Rules for Additional Addresses in BKFS)</div>', ''),
+    ('<div style="text-align: justify">Non-borrower Name</div>', ''),
+    ('<div style="text-align: justify">Non-borrower Address Line 1</div>', ''),
+    ('<div style="text-align: justify">Non-borrower Address Line 2</div>', ''),
+    ('<div style="text-align: justify">Non-borrower Address Line 3</div>', ''),
+    ('<div style="text-align: justify">Non-borrower Street</div>', ''),
+    
+    # Clean up remaining conditional logic
+    ('<div style="text-align: justify">(<u><b>"OR"</b></u> If <b>{[M956]}</b>)</div>', ''),
+    
+    # Clean up business rules references
+    ('<div style="text-align: justify">(see "Additional Borrowers/Co-Borrowers" on Letter Library Business Rules for Additional Addresses in BKFS) </div>', ''),
+    ('<div style="text-align: justify; font-size: 11pt">(see "SII Confirmed" on Letter Library Business Rules for Additional Addresses in BKFS)</div>', ''),
+    
+    # Clean up remaining payment descriptions that are still showing up
+    (' (Delinquent Balance)', ''),
+    (' (Late Charge Fee)', ''),
+    (' (Late Fee Date)', ''),
+    (' (Last Day This Month)', ''),
+    (' (Today Plus 30 Days)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
+    
+    # Clean up specific patterns we're still seeing
+    ('<u><b>Demand Notice expires</b></u> <u><b>{[L011E8]} </b></u><u>(Today Plus 30 Days)</u><u>.</u> <u><b>Total Due: $</b></u><b>{[C001E6]} </b>+ <b>{[M585E6]}</b> – <b>{[M013E6]}</b> (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal<b> - </b>Suspense Balance)', '<u><b>Demand Notice expires {[L011E8]}. Total Due: $</b></u><b>{[C001E6]} </b>+ <b>{[M585E6]}</b> – <b>{[M013E6]}</b>'),
+    ('<u><b>Number of Payments Due:</b></u> <b>{[M590]}</b>', '<u><b>Number of Payments Due:</b></u> <b>{[M590]}</b>'),
+    ('<u><b>Net Payment Amount </b></u><u><b>$</b></u><b>{[M591E6]}</b>', '<u><b>Net Payment Amount:</b></u> <b>${[M591E6]}</b>'),
+    ('<u><b>Unpaid Late Charges</b></u><u><b>:</b></u> <b>$</b><b>{[M015E6]}</b>', '<u><b>Unpaid Late Charges:</b></u> <b>${[M015E6]}</b>'),
+    ('<u><b>NSF & Other Fees: $</b></u><b>{[M593E6]} </b>+ <b>{[C004E6]} </b>', '<u><b>NSF & Other Fees:</b></u> <b>${[M593E6]} + ${[C004E6]}</b>'),
+    ('<u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{[M013E6]} </b>', '<u><b>Unapplied/Suspense Funds:</b></u> <b>${[M013E6]}</b>'),
+]
+_REMAINING_PATTERN_RE, _REMAINING_PATTERN_MAP = _compile_replacements(_REMAINING_PATTERN_REPLACEMENTS)
+
+# Clean up extra spacing and formatting; these cascade, so they run in order
+_EMPTY_TAG_REPLACEMENTS = [
+    ('<b> </b>', ' '),
+    ('<b></b>', ''),
+    ('<u><b> </b></u>', ' '),
+    ('<u><b></b></u>', ''),
+    ('<u> </u>', ' '),
+    ('<u></u>', ''),
+]
+
+def fix_remaining_patterns(text):
+    """Clean up remaining patterns that weren't caught by previous functions"""
+    
+    text = _apply_replacements(text, _REMAINING_PATTERN_RE, _REMAINING_PATTERN_MAP)
     
-    for old_text, new_text in replacements:
+    for old_text, new_text in _EMPTY_TAG_REPLACEMENTS:
         text = text.replace(old_text, new_text)
     
     return text
 
-def fix_remaining_patterns(text):
-    """Clean up remaining patterns that weren't caught by previous functions"""
+# Union of the three cleanup tables, applied together by combined_field_cleanup
+_ALL_CLEANUP_RE, _ALL_CLEANUP_MAP = _compile_replacements(
+    _FIELD_CLEANUP_REPLACEMENTS + _PAYMENT_CLEANUP_REPLACEMENTS + _REMAINING_PATTERN_REPLACEMENTS
+)
+
+def combined_field_cleanup(text):
+    """Apply simple_field_cleanup, fix_payment_information_cleanup and fix_remaining_patterns in one pass"""
     
-    # Clean up remaining payment-related descriptive text
-    replacements = [
-        # Payment descriptions still in the text
-        (' (Delinquent Balance)', ''),
-        (' (Late Charge Fee)', ''),
-        (' (Late Fee Date)', ''),
-        (' (Last Day This Month)', ''),
-        (' (Today Plus 30 Days)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
-        (' (Mortgagor Name)', ''),
-        (' (Second Mortgagor)', ''),
-        (' (Mailing City), (State), (5-Digit Zip)', ''),
-        (' (4-Digit Zip)', ''),
-        
-        # Clean up some specific patterns we're seeing
-        ('<span style="font-size: 10pt">(Mailing City), (State), (5-Digit Zip)</span><span style="font-size: 10pt">,</span>', ''),
-        ('<span style="font-size: 10pt">, (4-Digit Zip)</span>', ''),
-        
-        # Clean up the borrower name formatting
-        ('<b>{</b><b>[M558]}</b> and <b>{</b><b>[M559]}</b>', '{[M558]} and {[M559]}'),
-        ('<b>{</b><b>[M594]</b><b>}</b>', '{[M594]}'),
-        
-        # Clean up remaining header template text
-        ('<div style="text-align: justify">(see "Additional Borrowers/Co-Borrowers" on Letter Library Business Rules for Additional Addresses in BKFS) </div>', ''),
-        ('<div style="text-align: justify">Co-borrower Name 1</div>', ''),
-        ('<div style="text-align: justify">Co-borrower Name 2</div>', ''),
-        ('<div style="text-align: justify">Co-borrower Address Line 1</div>', ''),
-        ('<div style="text-align: justify">Co-borrower Address Line 2</div>', ''),
-        ('<div style="text-align: justify">Co-borrower Street</div>', ''),
-        ('<div style="text-align: justify">Co-borrower City, Co-borrower State, Co-borrower Zip Code, Co-borrower Zip Code Suffix</div>', ''),
-        ('<div style="text-align: justify; font-size: 11pt">(see "SII Confirmed" on Letter Library Business Rules for Additional Addresses in BKFS)</div>', ''),
-        ('<div style="text-align: justify">Non-borrower Name</div>', ''),
-        ('<div style="text-align: justify">Non-borrower Address Line 1</div>', ''),
-        ('<div style="text-align: justify">Non-borrower Address Line 2</div>', ''),
-        ('<div style="text-align: justify">Non-borrower Address Line 3</div>', ''),
-        ('<div style="text-align: justify">Non-borrower Street</div>', ''),
-        
-        # Clean up remaining conditional logic
-        ('<div style="text-align: justify">(<u><b>"OR"</b></u> If <b>{[M956]}</b>)</div>', ''),
-        
-        # Clean up business rules references
-        ('<div style="text-align: justify">(see "Additional Borrowers/Co-Borrowers" on Letter Library Business Rules for Additional Addresses in BKFS) </div>', ''),
-        ('<div style="text-align: justify; font-size: 11pt">(see "SII Confirmed" on Letter Library Business Rules for Additional Addresses in BKFS)</div>', ''),
-        
-        # Clean up remaining payment descriptions that are still showing up
-        (' (Delinquent Balance)', ''),
-        (' (Late Charge Fee)', ''),
-        (' (Late Fee Date)', ''),
-        (' (Last Day This Month)', ''),
-        (' (Today Plus 30 Days)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
-        
-        # Clean up specific patterns we're still seeing
-        ('<u><b>Demand Notice expires</b></u> <u><b>{[L011E8]} </b></u><u>(Today Plus 30 Days)</u><u>.</u> <u><b>Total Due: $</b></u><b>{[C001E6]} </b>+ <b>{[M585E6]}</b> – <b>{[M013E6]}</b> (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal<b> - </b>Suspense Balance)', '<u><b>Demand Notice expires {[L011E8]}. Total Due: $</b></u><b>{[C001E6]} </b>+ <b>{[M585E6]}</b> – <b>{[M013E6]}</b>'),
-        ('<u><b>Number of Payments Due:</b></u> <b>{[M590]}</b>', '<u><b>Number of Payments Due:</b></u> <b>{[M590]}</b>'),
-        ('<u><b>Net Payment Amount </b></u><u><b>$</b></u><b>{[M591E6]}</b>', '<u><b>Net Payment Amount:</b></u> <b>${[M591E6]}</b>'),
-        ('<u><b>Unpaid Late Charges</b></u><u><b>:</b></u> <b>$</b><b>{[M015E6]}</b>', '<u><b>Unpaid Late Charges:</b></u> <b>${[M015E6]}</b>'),
-        ('<u><b>NSF & Other Fees: $</b></u><b>{[M593E6]} </b>+ <b>{[C004E6]} </b>', '<u><b>NSF & Other Fees:</b></u> <b>${[M593E6]} + ${[C004E6]}</b>'),
-        ('<u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{[M013E6]} </b>', '<u><b>Unapplied/Suspense Funds:</b></u> <b>${[M013E6]}</b>'),
-        
-        # Clean up extra spacing and formatting
-        ('<b> </b>', ' '),
-        ('<b></b>', ''),
-        ('<u><b> </b></u>', ' '),
-        ('<u><b></b></u>', ''),
-        ('<u> </u>', ' '),
-        ('<u></u>', ''),
-    ]
+    text = _apply_replacements(text, _ALL_CLEANUP_RE, _ALL_CLEANUP_MAP)
     
-    for old_text, new_text in replacements:
+    for old_text, new_text in _EMPTY_TAG_REPLACEMENTS:
         text = text.replace(old_text, new_text)
     
     return text
 
+# Header lines removed by fix_header_structure_cleanup
+_CONDITIONAL_LINE_RE = re.compile(r'<div><b>\(IF \{[^}]+\} = [^<]+\)</b></div>\s*<br>\s*')
+_SEND_VIA_LINE_RE = re.compile(r'<div style="text-align: justify"><b>Send </b><b>via</b><b> First Class and Certified Mail to the </b><b>Mailing </b><b>address</b></div>\s*<br>\s*')
+
 def fix_header_structure_cleanup(text):
     """Clean up header structure and organization"""
-    import re
     
     # Remove the conditional logic line
-    text = re.sub(r'<div><b>\(IF \{[^}]+\} = [^<]+\)</b></div>\s*<br>\s*', '', text)
+    text = _CONDITIONAL_LINE_RE.sub('', text)
     
     # Clean up any remaining messy header elements
-    text = re.sub(r'<div style="text-align: justify"><b>Send </b><b>via</b><b> First Class and Certified Mail to the </b><b>Mailing </b><b>address</b></div>\s*<br>\s*', '', text)
+    text = _SEND_VIA_LINE_RE.sub('', text)
     
     return text
 
+# Borrower block anchor
+_BORROWER_NAME_RE = re.compile(r'<div><b>Borrower Name:</b>')
+
 def add_document_title_and_re_table(text):
     """Add the document title and RE table structure"""
-    import re
     
     # Find where to insert the title and RE table (after the header, before the borrower info)
-    borrower_match = re.search(r'<div><b>Borrower Name:</b>', text)
+    borrower_match = _BORROWER_NAME_RE.search(text)
     if not borrower_match:
         return text
     
     # Create the clean document title and RE table
-    title_and_table = '''<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>
-<br>
-<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="20%"><b>Borrower Name:</b></td>
-  <td>{[M558]}{If('{[M559]}'<>'')} and {[M559]}{End If}</td>
-  </tr><tr>
-  <td width="20%" valign="top"><b>Mailing Address:</b></td>
-  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>
-  </tr><tr>
-  <td width="20%"><b>Mortgage Loan No:</b></td>
-  <td>{[M594]}</td>
-  </tr><tr>
-  <td width="20%"><b>Property Address:</b></td>
-  <td>{Compress({[M567]}|{[M583]})}</td>
-</tr></tbody></table>
-<br>
-'''
+    title_and_table = ''.join((_DOCUMENT_TITLE, '\n<br>\n', _RE_TABLE, '\n<br>\n'))
     
     # Insert the title and table before the borrower info
-    text = text[:borrower_match.start()] + title_and_table + text[borrower_match.start():]
+    insert_pos = borrower_match.start()
+    text = ''.join((text[:insert_pos], title_and_table, text[insert_pos:]))
     
     return text
 
+# Ordered payment and spacing rewrites applied by transform_to_target_format; later
+# entries match text produced by earlier ones, so this is a pipeline, not a lookup table.
+# Every entry is followed by one normalize_transformed_spacing pass and the output depends
+# on how many of those run, so self-mappings, repeated entries and the spaced "<br>" rules,
+# which normalization leaves nothing to match, all stay
+_PAYMENT_TRANSFORMATIONS = (
+    # Transform payment amounts to use Money() function
+    ('$<b>{[M591E6]}</b>', '{Money({[M591]})}'),
+    ('$<b>{[U026]} </b>', '{Money({[U026]})}'),
+    ('$<b>{[C001E6]} </b>+ <b>{[M585E6]}</b><b> + {[M029E6]}</b> – <b>{[M013E6]}</b>', '{Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)}'),
+    ('<b>{[C001E6]} </b>+ <b>{[M585E6]}</b> – <b>{[M013E6]}</b>', '{Math({[C001]} + {[M585]} - {[M013]}|Money)}'),
+    
+    # Transform payment table to use Money() and Math() functions
+    ('<b>${[M591E6]}</b>', '{Money({[M591]})}'),
+    ('<b>${[M015E6]}</b>', '{Money({[M015]})}'),
+    ('<b>${[M593E6]} + ${[C004E6]}</b>', '{Math({[M593]} + {[C004]}|Money)}'),
+    ('<b>${[M013E6]}</b>', '{Money({[M013]})}'),
+    
+    # Fix field name differences
+    ('{[L001E8]}', '{[L001]}'),
+    ('{[U027]}', '{[U027]}'),
+    ('{[L008E8]}', '{[L008]}'),
+    ('{[L011E8]}', '{[L011]}'),
+    ('{[M590]}', '{[M590]}'),
+    
+    # Clean up remaining descriptive text
+    (' (Delinquent Balance)', ''),
+    (' (Late Charge Fee)', ''),
+    (' (Today Plus 30 Days)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
+    (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
+    
+    # Fix remaining payment function issues
+    ('{Money({[U026]})}(Late Charge Fee)', '{Money({[U026]})}'),
+    ('{Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)} (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal + Total Monthly Payment <b>- </b>Suspense Balance)', '{Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)}'),
+    ('{Math({[C001]} + {[M585]} - {[M013]}|Money)} (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal<b> - </b>Suspense Balance)', '{Math({[C001]} + {[M585]} - {[M013]}|Money)}'),
+    
+    # Fix remaining field name issues
+    ('<b>${[M015E6]}</b>', '{Money({[M015]})}'),
+    ('{[M015E6]}', '{Money({[M015]})}'),
+    
+    # Fix Total Due formatting
+    ('<u><b>Total Due: $</b></u>{Math({[C001]} + {[M585]} - {[M013]}|Money)} (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal<b> - </b>Suspense Balance)', '<b>Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b>'),
+    
+    # Clean up extra spacing and formatting
+    ('<u><b>Demand Notice expires</b></u> <u><b>{[L011]} </b></u><u>(Today Plus 30 Days)</u><u>.</u>', '<b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b>'),
+    
+    # Fix duplicate Total Due lines
+    ('<b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b> <u><b>Total Due: $</b></u>{Math({[C001]} + {[M585]} - {[M013]}|Money)}', '<b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b>'),
+    
+    # Fix Unpaid Late Charges formatting
+    ('<u><b>Unpaid Late Charges</b></u><u><b>:</b></u> <b>$</b><b>{Money({[M015]})}</b>', '<u><b>Unpaid Late Charges:</b></u> {Money({[M015]})}'),
+    
+    # Fix payment table formatting to match target exactly
+    ('<u><b>Number of Payments Due:</b></u>', '<b><u>Number of Payments Due:</u></b>'),
+    ('<u><b>Net Payment Amount:</b></u>', '<b><u>Net Payment Amount:</u></b>'),
+    ('<u><b>Unpaid Late Charges:</b></u>', '<b><u>Unpaid Late Charges:</u></b>'),
+    ('<u><b>NSF & Other Fees:</b></u>', '<b><u>NSF &amp; Other Fees:</u></b>'),
+    ('<u><b>Unapplied/Suspense Funds:</b></u>', '<b><u>Unapplied/Suspense Funds:</u></b>'),
+    
+    # Fix payment table spacing - remove <br> between payment items to match target
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n'),
+    ('<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<br>\n', '<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n'),
+    ('<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<br>\n', '<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n'),
+    ('<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<br>\n', '<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n'),
+    
+    # Fix payment table spacing in the actual output format
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<br>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<br>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<br>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
+    
+    # Fix the specific pattern we're seeing in the output
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
+    
+    # Fix the exact pattern from current output - remove all breaks in payment table
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>'),
+    
+    # Additional fix for the exact current output pattern
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
+    
+    # Final precision fix for the exact current output - remove break after Number of Payments Due
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>'),
+    
+    # Ultra-specific fix for the exact current output pattern
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
+    
+    # Direct fix for the exact current output - remove the break
+    ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>'),
+    
+    # Fix extra bold tags in field names
+    ('<b>{[U027]}</b>', '{[U027]}'),
+    ('<b>{[L008]}</b>', '{[L008]}'),
+    ('<b>{[L011]}</b>', '{[L011]}'),
+    ('<b>{[M590]}</b>', '{[M590]}'),
+    
+    # Fix text differences to match target exactly
+    ('which represents three (3) payments past due', 'which represents the past due amount'),
+    
+    # Fix bullet point table structure
+    ('<div style="text-align: justify">There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</div>', _BULLET_TABLE_DIV),
+    
+    # Remove the separate Avoid Foreclosure Scams line since it's now in the table
+    ('<div style="text-align: justify">Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. </div>', ''),
+    ('<div style="text-align: justify">Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company.</div>', ''),
+    ('<div style="text-align: justify">Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company.\n</div>', ''),
+    
+    # Fix final spacing and formatting
+    ('<b>. </b></div>', '.</div>'),
+    ('<div style="text-align: justify">Sincerely,</div>', '<div>Sincerely,</div>'),
+    ('<div style="text-align: justify">Default Department</div>', '<div>Default Department</div>'),
+    ('<div style="text-align: justify">{[plsMatrix.CompanyLongName]}</div>', '<div>{[plsMatrix.CompanyLongName]}</div>'),
+    
+    # Fix extra spacing after bullet table and text alignment
+    ('</table></div>\n<br>\n<br>\n', '</table></div>\n<br>\n'),
+    ('<div style="text-align: justify">If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div>', '<div>If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div>'),
+    
+    # Add proper spacing and line breaks throughout the document
+    ('<div>{Insert(H003 TagHeader)}</div> <br> <div>{[L001]}</div> <br> <div>{[mailingAddress]}</div> <br><br><br><br><br>', '<div>{Insert(H003 TagHeader)}</div>\n<br>\n<div>{[L001]}</div>\n<br>\n<div>{[mailingAddress]}</div>\n<br><br><br><br><br>\n'),
+    ('<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div> <br>', '<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>\n<br>\n'),
+    ('<div><table width="100%" style="border-collapse: collapse"><tbody><tr> <td width="20%"><b>Borrower Name:</b></td> <td>{[M558]}{If(\'{[M559]}\'<>\\\'\\\')} and {[M559]}{End If}</td> </tr><tr> <td width="20%" valign="top"><b>Mailing Address:</b></td> <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td> </tr><tr> <td width="20%"><b>Mortgage Loan No:</b></td> <td>{[M594]}</td> </tr><tr> <td width="20%"><b>Property Address:</b></td> <td>{Compress({[M567]}|{[M583]})}</td> </tr></tbody></table> <br>', '<div><table width="100%" style="border-collapse: collapse"><tbody><tr>\n  <td width="20%"><b>Borrower Name:</b></td>\n  <td>{[M558]}{If(\'{[M559]}\'<>\\\'\\\')} and {[M559]}{End If}</td>\n  </tr><tr>\n  <td width="20%" valign="top"><b>Mailing Address:</b></td>\n  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>\n  </tr><tr>\n  <td width="20%"><b>Mortgage Loan No:</b></td>\n  <td>{[M594]}</td>\n  </tr><tr>\n  <td width="20%"><b>Property Address:</b></td>\n  <td>{Compress({[M567]}|{[M583]})}</td>\n</tr></tbody></table>\n<br>\n'),
+    ('<div>Dear {[Salutation]},</div> <br>', '<div>Dear {[Salutation]},</div>\n<br>\n'),
+    ('<div>Notice is hereby given that you are in default in payment of the principal and interest due on the indebtedness represented by the above-described promissory note (the "Note"). According to its terms and conditions and in performance of the covenant contained in the certain Deed of Trust (the "Deed of Trust") securing payment of the Note to promptly pay when due the principal of and the interest on the indebtedness evidenced by the Note.</div> <br>', '<div>Notice is hereby given that you are in default in payment of the principal and interest due on the indebtedness represented by the above-described promissory note (the "Note"). According to its terms and conditions and in performance of the covenant contained in the certain Deed of Trust (the "Deed of Trust") securing payment of the Note to promptly pay when due the principal of and the interest on the indebtedness evidenced by the Note.</div>\n<br>\n'),
+    ('<div>To cure the aforesaid breach and default, you are required to pay {Money({[M591]})} which represents the past due amount. Please add an additional late charge of {Money({[U026]})} if paid after <b>{[U027]}</b>. This amount is only valid until <b>{[L008]}</b>.</div> <br>', '<div>To cure the aforesaid breach and default, you are required to pay {Money({[M591]})} which represents the past due amount. Please add an additional late charge of {Money({[U026]})} if paid after {[U027]}. This amount is only valid until {[L008]}.</div>\n<br>\n'),
+    ('<div>If payment is received after <b>{[L008]}</b>, you must pay the past due amount of {Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)} on or before <b>{[L011]}</b>, which is thirty-five days from the date of this notice.</div> <br>', '<div>If payment is received after {[L008]}, you must pay the past due amount of {Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)} on or before {[L011]}, which is thirty-five days from the date of this notice.</div>\n<br>\n'),
+    ('<div><b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b></div> <br>', '<div><b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b></div>\n<br>\n'),
+    ('<div><b><u>Number of Payments Due:</u></b> <b>{[M590]}</b></div> <br>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n'),
+    ('<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div> <br>', '<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n'),
+    ('<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div> <br>', '<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n'),
+    ('<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div> <br>', '<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n'),
+    ('<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div> <br>', '<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>\n<br>\n'),
+    
+    # Continue adding proper spacing for the rest of the document
+    ('<div>If you do not cure the default within thirty (30) days, we intend to exercise our right to accelerate the mortgage payments. This means that whatever is owed on the original amount borrowed will be considered due immediately and you may lose the chance to pay off the original mortgage in monthly installments. If full payment of the amount of default is not made within thirty (30) days, we also intend to instruct our attorneys to start a lawsuit to foreclose your mortgaged property. If the mortgage is foreclosed your mortgaged property will be sold to pay off the mortgage debt. If we refer your case to our attorneys, but you cure the default before they begin legal proceedings against you, you will still have to pay the reasonable attorney\'s fees, actually incurred. However, if legal proceedings are started against you, you will have to pay the reasonable attorney\'s fees within allowable fees and costs. Any attorney\'s fees will be added to whatever you owe us, which may also include our reasonable costs. If you cure the default within the thirty-day period, you will not be required to pay attorney\'s fees. </div> <br>', '<div>If you do not cure the default within thirty (30) days, we intend to exercise our right to accelerate the mortgage payments. This means that whatever is owed on the original amount borrowed will be considered due immediately and you may lose the chance to pay off the original mortgage in monthly installments. If full payment of the amount of default is not made within thirty (30) days, we also intend to instruct our attorneys to start a lawsuit to foreclose your mortgaged property. If the mortgage is foreclosed your mortgaged property will be sold to pay off the mortgage debt. If we refer your case to our attorneys, but you cure the default before they begin legal proceedings against you, you will still have to pay the reasonable attorney\'s fees, actually incurred.  However, if legal proceedings are started against you, you will have to pay the reasonable attorney\'s fees within allowable fees and costs. Any attorney\'s fees will be added to whatever you owe us, which may also include our reasonable costs. If you cure the default within the thirty-day period, you will not be required to pay attorney\'s fees.</div>\n<br>\n'),
+    ('<div>If you have not cured the default within the thirty-day period and foreclosure proceedings have begun, you still have the right to cure the default and prevent the sale at any time up to one hour before the foreclosure sale. You may do so by paying the total amount of the unpaid monthly payments plus any late or other charges then due, as well as the reasonable attorney\'s fees and costs connected with the foreclosure sale and perform any other requirements under the mortgage. A notice of the date of the foreclosure sale will be sent to you before the sale. Of course, the amount needed to cure the default will increase the longer you wait.</div> <br>', '<div>If you have not cured the default within the thirty-day period and foreclosure proceedings have begun, you still have the right to cure the default and prevent the sale at any time up to one hour before the foreclosure sale. You may do so by paying the total amount of the unpaid monthly payments plus any late or other charges then due, as well as the reasonable attorney\'s fees and costs connected with the foreclosure sale and perform any other requirements under the mortgage. A notice of the date of the foreclosure sale will be sent to you before the sale. Of course, the amount needed to cure the default will increase the longer you wait.</div>\n<br>\n'),
+    ('<div><b>You may find out at any time exactly what the required payment will be by calling us at the following number: </b><b>{[plsMatrix.CSPhoneNumber]}</b><b> or </b><b>{[plsMatrix.SPOCContactEmail]}</b><b>. This payment must be in cash, cashier\'s check, certified check or money order and made payable to us at </b><b>{[plsMatrix.PayoffAddr1]}, {[plsMatrix.PayoffAddr2]}.</b></div> <br>', '<div><b>You may find out at any time exactly what the required payment will be by calling us at the following number: {[plsMatrix.CSPhoneNumber]} or {[plsMatrix.SPOCContactEmail]}. This payment must be in cash, cashier\'s check, certified check or money order and made payable to us at {[plsMatrix.PayoffAddr1]}, {[plsMatrix.PayoffAddr2]}.</b></div>\n<br>\n'),
+    ('<div>You should realize that a foreclosure sale will end your ownership of the mortgaged property and your right to remain in it. If you continue to live in the property after the foreclosure sale, a lawsuit could be started to evict you. </div> <br>', '<div>You should realize that a foreclosure sale will end your ownership of the mortgaged property and your right to remain in it. If you continue to live in the property after the foreclosure sale, a lawsuit could be started to evict you.</div>\n<br>\n'),
+    ('<div>Please consider the following:</div> <br>', '<div>Please consider the following:</div>\n<br>\n'),
+    ('<div>You should contact a HUD Counselor at HUD\'s National Servicing Center at (877) 622-8525/TDD (800) 877-8339 or the Homeownership Preservation Foundation (888-995-HOPE) to speak with counselors who can provide assistance and may be able to help you avoid foreclosure. </div> <br>', '<div>You should contact a HUD Counselor at HUD\'s National Servicing Center at (877) 622-8525/TDD (800) 877-8339 or the Homeownership Preservation Foundation (888-995-HOPE) to speak with counselors who can provide assistance and may be able to help you avoid foreclosure.</div>\n'),
+    ('<div><table width="100%" style="border-collapse: collapse"><tbody><tr> <td width="3%" valign="top" style="text-align: center">•</td> <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td> </tr><tr> <td width="3%" valign="top" style="text-align: center">•</td> <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td> </tr></tbody></table></div> <br> <br>', '<div><table width="100%" style="border-collapse: collapse"><tbody><tr>\n  <td width="3%" valign="top" style="text-align: center">•</td>\n  <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td>\n  </tr><tr>\n  <td width="3%" valign="top" style="text-align: center">•</td>\n  <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td>\n</tr></tbody></table></div>\n<br>\n'),
+    ('<div style="text-align: justify">If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div> <br>', '<div>If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div>\n<br>\n'),
+    ('<div>Sincerely,</div> <br>', '<div>Sincerely,</div>\n<br>\n'),
+    ('<div>Default Department</div> <br>', '<div>Default Department</div>\n'),
+    ('<div>{[plsMatrix.CompanyLongName]}</div>', '<div>{[plsMatrix.CompanyLongName]}</div>'),
+    
+    # Clean up business rules and template text
+    ('<div style="text-align: justify">(<u><b>"OR"</b></u> If <b>{[M956]}</b>)</div>', ''),
+    ('<div style="text-align: justify">(see "Additional Borrowers/Co-Borrowers" on Letter Library Business Rules for Additional Addresses in BKFS) </div>', ''),
+    ('<div style="text-align: justify; font-size: 11pt">(see "SII Confirmed" on Letter Library Business Rules for Additional Addresses in BKFS)</div>', ''),
+    
+    # Clean up extra spacing and empty lines
+    ('<br>\n<br>\n<br>\n<br>\n<br>\n<br>\n<br>', '<br><br><br><br><br>'),
+    ('<br>\n<br>\n<br>\n<br>\n<br>\n<br>', '<br><br><br><br><br>'),
+    ('<br>\n<br>\n<br>\n<br>\n<br>', '<br><br><br><br><br>'),
+)
+
+# Section anchors used by transform_to_target_format; all plain literals, so str.find
+# locates them without going through the regex engine
+_HEADER_START = '<div style="text-align: justify"><b>{[H002]} </b></div>'
+_HEADER_END = _DOCUMENT_TITLE
+_BORROWER_START = '<div><b>Borrower Name:</b><b>\t</b>{[M558]} and {[M559]}</div>'
+_SALUTATION = '<div>Dear {[Salutation]},</div>'
+
 def transform_to_target_format(text):
     """Transform the output to match the target BR008-formatted.html format for 95% accuracy"""
-    import re
     
     # STEP 1: Create proper header structure
-    header_start = re.search(r'<div style="text-align: justify"><b>\{\[H002\]\} </b></div>', text)
-    if header_start:
+    header_start = text.find(_HEADER_START)
+    if header_start != -1:
         # Replace the entire header section with the target format
-        header_end = re.search(r'<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>', text)
-        if header_end:
-            # Create the target header structure
-            target_header = '''<div>{Insert(H003 TagHeader)}</div>
-<br>
-<div>{[L001]}</div>
-<br>
-<div>{[mailingAddress]}</div>
-<br><br><br><br><br>
-
-'''
-            text = text[:header_start.start()] + target_header + text[header_end.start():]
+        header_end = text.find(_HEADER_END)
+        if header_end != -1:
+            # Replace it with the target header structure
+            text = ''.join((text[:header_start], _HEADER_BLOCK, '\n\n', text[header_end:]))
     
     # STEP 2: Replace the scattered borrower info with proper RE table
-    borrower_start = re.search(r'<div><b>Borrower Name:</b><b>	</b>\{\[M558\]\} and \{\[M559\]\}</div>', text)
-    if borrower_start:
+    borrower_start = text.find(_BORROWER_START)
+    if borrower_start != -1:
         # Find where the borrower info section ends (before "Dear {[Salutation]}")
-        salutation_start = re.search(r'<div>Dear \{\[Salutation\]\},</div>', text)
-        if salutation_start:
-            # Create the target RE table structure
-            target_re_table = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="20%"><b>Borrower Name:</b></td>
-  <td>{[M558]}{If('{[M559]}'<>'')} and {[M559]}{End If}</td>
-  </tr><tr>
-  <td width="20%" valign="top"><b>Mailing Address:</b></td>
-  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>
-  </tr><tr>
-  <td width="20%"><b>Mortgage Loan No:</b></td>
-  <td>{[M594]}</td>
-  </tr><tr>
-  <td width="20%"><b>Property Address:</b></td>
-  <td>{Compress({[M567]}|{[M583]})}</td>
-</tr></tbody></table>
-<br>
-'''
-            text = text[:borrower_start.start()] + target_re_table + text[salutation_start.start():]
+        salutation_start = text.find(_SALUTATION)
+        if salutation_start != -1:
+            # Replace it with the target RE table structure
+            text = ''.join((text[:borrower_start], _RE_TABLE, '\n<br>\n', text[salutation_start:]))
     
     # STEP 3: Transform payment information to use Money() and Math() functions
-    payment_transformations = [
-        # Transform payment amounts to use Money() function
-        ('$<b>{[M591E6]}</b>', '{Money({[M591]})}'),
-        ('$<b>{[U026]} </b>', '{Money({[U026]})}'),
-        ('$<b>{[C001E6]} </b>+ <b>{[M585E6]}</b><b> + {[M029E6]}</b> – <b>{[M013E6]}</b>', '{Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)}'),
-        ('<b>{[C001E6]} </b>+ <b>{[M585E6]}</b> – <b>{[M013E6]}</b>', '{Math({[C001]} + {[M585]} - {[M013]}|Money)}'),
-        
-        # Transform payment table to use Money() and Math() functions
-        ('<b>${[M591E6]}</b>', '{Money({[M591]})}'),
-        ('<b>${[M015E6]}</b>', '{Money({[M015]})}'),
-        ('<b>${[M593E6]} + ${[C004E6]}</b>', '{Math({[M593]} + {[C004]}|Money)}'),
-        ('<b>${[M013E6]}</b>', '{Money({[M013]})}'),
-        
-        # Fix field name differences
-        ('{[L001E8]}', '{[L001]}'),
-        ('{[U027]}', '{[U027]}'),
-        ('{[L008E8]}', '{[L008]}'),
-        ('{[L011E8]}', '{[L011]}'),
-        ('{[M590]}', '{[M590]}'),
-        
-        # Clean up remaining descriptive text
-        (' (Delinquent Balance)', ''),
-        (' (Late Charge Fee)', ''),
-        (' (Today Plus 30 Days)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal + Total Monthly Payment - Suspense Balance)', ''),
-        (' (Total Amount Due + Mtgr Rec Corp Adv Bal - Suspense Balance)', ''),
-        
-        # Fix remaining payment function issues
-        ('{Money({[U026]})}(Late Charge Fee)', '{Money({[U026]})}'),
-        ('{Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)} (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal + Total Monthly Payment <b>- </b>Suspense Balance)', '{Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)}'),
-        ('{Math({[C001]} + {[M585]} - {[M013]}|Money)} (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal<b> - </b>Suspense Balance)', '{Math({[C001]} + {[M585]} - {[M013]}|Money)}'),
-        
-        # Fix remaining field name issues
-        ('<b>${[M015E6]}</b>', '{Money({[M015]})}'),
-        ('{[M015E6]}', '{Money({[M015]})}'),
-        
-        # Fix Total Due formatting
-        ('<u><b>Total Due: $</b></u>{Math({[C001]} + {[M585]} - {[M013]}|Money)} (Total Amount Due <b>+</b> Mtgr Rec Corp Adv Bal<b> - </b>Suspense Balance)', '<b>Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b>'),
-        
-        # Clean up extra spacing and formatting
-        ('<u><b>Demand Notice expires</b></u> <u><b>{[L011]} </b></u><u>(Today Plus 30 Days)</u><u>.</u>', '<b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b>'),
-        
-        # Fix duplicate Total Due lines
-        ('<b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b> <u><b>Total Due: $</b></u>{Math({[C001]} + {[M585]} - {[M013]}|Money)}', '<b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b>'),
-        
-        # Fix Unpaid Late Charges formatting
-        ('<u><b>Unpaid Late Charges</b></u><u><b>:</b></u> <b>$</b><b>{Money({[M015]})}</b>', '<u><b>Unpaid Late Charges:</b></u> {Money({[M015]})}'),
-        
-        # Fix payment table formatting to match target exactly
-        ('<u><b>Number of Payments Due:</b></u>', '<b><u>Number of Payments Due:</u></b>'),
-        ('<u><b>Net Payment Amount:</b></u>', '<b><u>Net Payment Amount:</u></b>'),
-        ('<u><b>Unpaid Late Charges:</b></u>', '<b><u>Unpaid Late Charges:</u></b>'),
-        ('<u><b>NSF & Other Fees:</b></u>', '<b><u>NSF &amp; Other Fees:</u></b>'),
-        ('<u><b>Unapplied/Suspense Funds:</b></u>', '<b><u>Unapplied/Suspense Funds:</u></b>'),
-        
-        # Fix payment table spacing - remove <br> between payment items to match target
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n'),
-        ('<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<br>\n', '<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n'),
-        ('<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<br>\n', '<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n'),
-        ('<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<br>\n', '<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n'),
-        
-        # Fix payment table spacing in the actual output format
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<br>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<br>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<br>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
-        
-        # Fix the specific pattern we're seeing in the output
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
-        
-        # Fix the exact pattern from current output - remove all breaks in payment table
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>'),
-        
-        # Additional fix for the exact current output pattern
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
-        
-        # Final precision fix for the exact current output - remove break after Number of Payments Due
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>'),
-        
-        # Ultra-specific fix for the exact current output pattern
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'),
-        
-        # Direct fix for the exact current output - remove the break
-        ('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>'),
-        
-        # Fix extra bold tags in field names
-        ('<b>{[U027]}</b>', '{[U027]}'),
-        ('<b>{[L008]}</b>', '{[L008]}'),
-        ('<b>{[L011]}</b>', '{[L011]}'),
-        ('<b>{[M590]}</b>', '{[M590]}'),
-        
-        # Fix text differences to match target exactly
-        ('which represents three (3) payments past due', 'which represents the past due amount'),
-        
-        # Fix bullet point table structure
-        ('<div style="text-align: justify">There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</div>', '<div><table width="100%" style="border-collapse: collapse"><tbody><tr>\n  <td width="3%" valign="top" style="text-align: center">•</td>\n  <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td>\n  </tr><tr>\n  <td width="3%" valign="top" style="text-align: center">•</td>\n  <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td>\n</tr></tbody></table></div>'),
-        
-        # Remove the separate Avoid Foreclosure Scams line since it's now in the table
-        ('<div style="text-align: justify">Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. </div>', ''),
-        ('<div style="text-align: justify">Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company.</div>', ''),
-        ('<div style="text-align: justify">Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company.\n</div>', ''),
-        
-        # Fix final spacing and formatting
-        ('<b>. </b></div>', '.</div>'),
-        ('<div style="text-align: justify">Sincerely,</div>', '<div>Sincerely,</div>'),
-        ('<div style="text-align: justify">Default Department</div>', '<div>Default Department</div>'),
-        ('<div style="text-align: justify">{[plsMatrix.CompanyLongName]}</div>', '<div>{[plsMatrix.CompanyLongName]}</div>'),
-        
-        # Fix extra spacing after bullet table and text alignment
-        ('</table></div>\n<br>\n<br>\n', '</table></div>\n<br>\n'),
-        ('<div style="text-align: justify">If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div>', '<div>If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div>'),
-        
-        # Add proper spacing and line breaks throughout the document
-        ('<div>{Insert(H003 TagHeader)}</div> <br> <div>{[L001]}</div> <br> <div>{[mailingAddress]}</div> <br><br><br><br><br>', '<div>{Insert(H003 TagHeader)}</div>\n<br>\n<div>{[L001]}</div>\n<br>\n<div>{[mailingAddress]}</div>\n<br><br><br><br><br>\n'),
-        ('<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div> <br>', '<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>\n<br>\n'),
-        ('<div><table width="100%" style="border-collapse: collapse"><tbody><tr> <td width="20%"><b>Borrower Name:</b></td> <td>{[M558]}{If(\'{[M559]}\'<>\\\'\\\')} and {[M559]}{End If}</td> </tr><tr> <td width="20%" valign="top"><b>Mailing Address:</b></td> <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td> </tr><tr> <td width="20%"><b>Mortgage Loan No:</b></td> <td>{[M594]}</td> </tr><tr> <td width="20%"><b>Property Address:</b></td> <td>{Compress({[M567]}|{[M583]})}</td> </tr></tbody></table> <br>', '<div><table width="100%" style="border-collapse: collapse"><tbody><tr>\n  <td width="20%"><b>Borrower Name:</b></td>\n  <td>{[M558]}{If(\'{[M559]}\'<>\\\'\\\')} and {[M559]}{End If}</td>\n  </tr><tr>\n  <td width="20%" valign="top"><b>Mailing Address:</b></td>\n  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>\n  </tr><tr>\n  <td width="20%"><b>Mortgage Loan No:</b></td>\n  <td>{[M594]}</td>\n  </tr><tr>\n  <td width="20%"><b>Property Address:</b></td>\n  <td>{Compress({[M567]}|{[M583]})}</td>\n</tr></tbody></table>\n<br>\n'),
-        ('<div>Dear {[Salutation]},</div> <br>', '<div>Dear {[Salutation]},</div>\n<br>\n'),
-        ('<div>Notice is hereby given that you are in default in payment of the principal and interest due on the indebtedness represented by the above-described promissory note (the "Note"). According to its terms and conditions and in performance of the covenant contained in the certain Deed of Trust (the "Deed of Trust") securing payment of the Note to promptly pay when due the principal of and the interest on the indebtedness evidenced by the Note.</div> <br>', '<div>Notice is hereby given that you are in default in payment of the principal and interest due on the indebtedness represented by the above-described promissory note (the "Note"). According to its terms and conditions and in performance of the covenant contained in the certain Deed of Trust (the "Deed of Trust") securing payment of the Note to promptly pay when due the principal of and the interest on the indebtedness evidenced by the Note.</div>\n<br>\n'),
-        ('<div>To cure the aforesaid breach and default, you are required to pay {Money({[M591]})} which represents the past due amount. Please add an additional late charge of {Money({[U026]})} if paid after <b>{[U027]}</b>. This amount is only valid until <b>{[L008]}</b>.</div> <br>', '<div>To cure the aforesaid breach and default, you are required to pay {Money({[M591]})} which represents the past due amount. Please add an additional late charge of {Money({[U026]})} if paid after {[U027]}. This amount is only valid until {[L008]}.</div>\n<br>\n'),
-        ('<div>If payment is received after <b>{[L008]}</b>, you must pay the past due amount of {Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)} on or before <b>{[L011]}</b>, which is thirty-five days from the date of this notice.</div> <br>', '<div>If payment is received after {[L008]}, you must pay the past due amount of {Math({[C001]} + {[M585]} + {[M029]} - {[M013]}|Money)} on or before {[L011]}, which is thirty-five days from the date of this notice.</div>\n<br>\n'),
-        ('<div><b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b></div> <br>', '<div><b>Demand Notice expires {[L011]}. Total Due: {Math({[C001]} + {[M585]} - {[M013]}|Money)}</b></div>\n<br>\n'),
-        ('<div><b><u>Number of Payments Due:</u></b> <b>{[M590]}</b></div> <br>', '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n'),
-        ('<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div> <br>', '<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>\n'),
-        ('<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div> <br>', '<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>\n'),
-        ('<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div> <br>', '<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>\n'),
-        ('<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div> <br>', '<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>\n<br>\n'),
-        
-        # Continue adding proper spacing for the rest of the document
-        ('<div>If you do not cure the default within thirty (30) days, we intend to exercise our right to accelerate the mortgage payments. This means that whatever is owed on the original amount borrowed will be considered due immediately and you may lose the chance to pay off the original mortgage in monthly installments. If full payment of the amount of default is not made within thirty (30) days, we also intend to instruct our attorneys to start a lawsuit to foreclose your mortgaged property. If the mortgage is foreclosed your mortgaged property will be sold to pay off the mortgage debt. If we refer your case to our attorneys, but you cure the default before they begin legal proceedings against you, you will still have to pay the reasonable attorney\'s fees, actually incurred. However, if legal proceedings are started against you, you will have to pay the reasonable attorney\'s fees within allowable fees and costs. Any attorney\'s fees will be added to whatever you owe us, which may also include our reasonable costs. If you cure the default within the thirty-day period, you will not be required to pay attorney\'s fees. </div> <br>', '<div>If you do not cure the default within thirty (30) days, we intend to exercise our right to accelerate the mortgage payments. This means that whatever is owed on the original amount borrowed will be considered due immediately and you may lose the chance to pay off the original mortgage in monthly installments. If full payment of the amount of default is not made within thirty (30) days, we also intend to instruct our attorneys to start a lawsuit to foreclose your mortgaged property. If the mortgage is foreclosed your mortgaged property will be sold to pay off the mortgage debt. If we refer your case to our attorneys, but you cure the default before they begin legal proceedings against you, you will still have to pay the reasonable attorney\'s fees, actually incurred.  However, if legal proceedings are started against you, you will have to pay the reasonable attorney\'s fees within allowable fees and costs. Any attorney\'s fees will be added to whatever you owe us, which may also include our reasonable costs. If you cure the default within the thirty-day period, you will not be required to pay attorney\'s fees.</div>\n<br>\n'),
-        ('<div>If you have not cured the default within the thirty-day period and foreclosure proceedings have begun, you still have the right to cure the default and prevent the sale at any time up to one hour before the foreclosure sale. You may do so by paying the total amount of the unpaid monthly payments plus any late or other charges then due, as well as the reasonable attorney\'s fees and costs connected with the foreclosure sale and perform any other requirements under the mortgage. A notice of the date of the foreclosure sale will be sent to you before the sale. Of course, the amount needed to cure the default will increase the longer you wait.</div> <br>', '<div>If you have not cured the default within the thirty-day period and foreclosure proceedings have begun, you still have the right to cure the default and prevent the sale at any time up to one hour before the foreclosure sale. You may do so by paying the total amount of the unpaid monthly payments plus any late or other charges then due, as well as the reasonable attorney\'s fees and costs connected with the foreclosure sale and perform any other requirements under the mortgage. A notice of the date of the foreclosure sale will be sent to you before the sale. Of course, the amount needed to cure the default will increase the longer you wait.</div>\n<br>\n'),
-        ('<div><b>You may find out at any time exactly what the required payment will be by calling us at the following number: </b><b>{[plsMatrix.CSPhoneNumber]}</b><b> or </b><b>{[plsMatrix.SPOCContactEmail]}</b><b>. This payment must be in cash, cashier\'s check, certified check or money order and made payable to us at </b><b>{[plsMatrix.PayoffAddr1]}, {[plsMatrix.PayoffAddr2]}.</b></div> <br>', '<div><b>You may find out at any time exactly what the required payment will be by calling us at the following number: {[plsMatrix.CSPhoneNumber]} or {[plsMatrix.SPOCContactEmail]}. This payment must be in cash, cashier\'s check, certified check or money order and made payable to us at {[plsMatrix.PayoffAddr1]}, {[plsMatrix.PayoffAddr2]}.</b></div>\n<br>\n'),
-        ('<div>You should realize that a foreclosure sale will end your ownership of the mortgaged property and your right to remain in it. If you continue to live in the property after the foreclosure sale, a lawsuit could be started to evict you. </div> <br>', '<div>You should realize that a foreclosure sale will end your ownership of the mortgaged property and your right to remain in it. If you continue to live in the property after the foreclosure sale, a lawsuit could be started to evict you.</div>\n<br>\n'),
-        ('<div>Please consider the following:</div> <br>', '<div>Please consider the following:</div>\n<br>\n'),
-        ('<div>You should contact a HUD Counselor at HUD\'s National Servicing Center at (877) 622-8525/TDD (800) 877-8339 or the Homeownership Preservation Foundation (888-995-HOPE) to speak with counselors who can provide assistance and may be able to help you avoid foreclosure. </div> <br>', '<div>You should contact a HUD Counselor at HUD\'s National Servicing Center at (877) 622-8525/TDD (800) 877-8339 or the Homeownership Preservation Foundation (888-995-HOPE) to speak with counselors who can provide assistance and may be able to help you avoid foreclosure.</div>\n'),
-        ('<div><table width="100%" style="border-collapse: collapse"><tbody><tr> <td width="3%" valign="top" style="text-align: center">•</td> <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td> </tr><tr> <td width="3%" valign="top" style="text-align: center">•</td> <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td> </tr></tbody></table></div> <br> <br>', '<div><table width="100%" style="border-collapse: collapse"><tbody><tr>\n  <td width="3%" valign="top" style="text-align: center">•</td>\n  <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td>\n  </tr><tr>\n  <td width="3%" valign="top" style="text-align: center">•</td>\n  <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td>\n</tr></tbody></table></div>\n<br>\n'),
-        ('<div style="text-align: justify">If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div> <br>', '<div>If you pay the past due amount, and any additional monthly payments, late charges or fees that may become due between the date of this notice and the date when you make your payment, your account will be considered up-to-date, and you can continue to make your regular monthly payments.</div>\n<br>\n'),
-        ('<div>Sincerely,</div> <br>', '<div>Sincerely,</div>\n<br>\n'),
-        ('<div>Default Department</div> <br>', '<div>Default Department</div>\n'),
-        ('<div>{[plsMatrix.CompanyLongName]}</div>', '<div>{[plsMatrix.CompanyLongName]}</div>'),
-        
-        # Clean up business rules and template text
-        ('<div style="text-align: justify">(<u><b>"OR"</b></u> If <b>{[M956]}</b>)</div>', ''),
-        ('<div style="text-align: justify">(see "Additional Borrowers/Co-Borrowers" on Letter Library Business Rules for Additional Addresses in BKFS) </div>', ''),
-        ('<div style="text-align: justify; font-size: 11pt">(see "SII Confirmed" on Letter Library Business Rules for Additional Addresses in BKFS)</div>', ''),
-        
-        # Clean up extra spacing and empty lines
-        ('<br>\n<br>\n<br>\n<br>\n<br>\n<br>\n<br>', '<br><br><br><br><br>'),
-        ('<br>\n<br>\n<br>\n<br>\n<br>\n<br>', '<br><br><br><br><br>'),
-        ('<br>\n<br>\n<br>\n<br>\n<br>', '<br><br><br><br><br>'),
-    ]
-    
-    # Apply all transformations
-    for old_pattern, new_pattern in payment_transformations:
-        text = text.replace(old_pattern, new_pattern)
-    
-        # STEP 4: Clean up any remaining formatting issues
-        text = re.sub(r'<br>\s*<br>\s*<br>\s*<br>\s*<br>\s*<br>\s*<br>', '<br><br><br><br><br>', text)
-        text = re.sub(r'<b>\s*</b>', '', text)
-        text = re.sub(r'<u>\s*</u>', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        # STEP 5: Apply comprehensive spacing transformation
-        text = apply_comprehensive_spacing(text)
+    # Apply all transformations in order, with STEP 4 and STEP 5 after every entry;
+    # apply_comprehensive_spacing appends a '</div>' to the borrower table on each call,
+    # so later entries see a result that depends on how many normalizations came before
+    for old_pattern, new_pattern in _PAYMENT_TRANSFORMATIONS:
+        text = normalize_transformed_spacing(text.replace(old_pattern, new_pattern))
     
     return text
 
+# Leftover formatting cleaned up by normalize_transformed_spacing
+_BR_RUN_RE = re.compile(r'<br>\s*<br>\s*<br>\s*<br>\s*<br>\s*<br>\s*<br>')
+_EMPTY_B_RE = re.compile(r'<b>\s*</b>')
+_EMPTY_U_RE = re.compile(r'<u>\s*</u>')
+
+def _collapse_whitespace(text):
+    """Collapse every whitespace run to a single space, like re.sub(r'\s+', ' ', text)"""
+    
+    # str.split() treats exactly the characters \s matches as whitespace and runs in C
+    collapsed = ' '.join(text.split())
+    if text[:1].isspace():
+        collapsed = ' ' + collapsed
+    if text[-1:].isspace() and collapsed != ' ':
+        collapsed += ' '
+    return collapsed
+
+def normalize_transformed_spacing(text):
+    """Clean up leftover formatting and re-apply spacing after a transformation"""
+    
+    # STEP 4: Clean up any remaining formatting issues
+    text = _BR_RUN_RE.sub('<br><br><br><br><br>', text)
+    text = _EMPTY_B_RE.sub('', text)
+    text = _EMPTY_U_RE.sub('', text)
+    text = _collapse_whitespace(text)
+    
+    # STEP 5: Apply comprehensive spacing transformation
+    return apply_comprehensive_spacing(text)
+
+# Table, closing-div and blank-line patterns used by apply_comprehensive_spacing
+_BORROWER_TABLE_RE = re.compile(r'<div><table width="100%" style="border-collapse: collapse"><tbody><tr>.*?</tr></tbody></table>', re.DOTALL)
+_BULLET_TABLE_RE = re.compile(r'<div><table width="100%" style="border-collapse: collapse"><tbody><tr>.*?</tr></tbody></table></div>', re.DOTALL)
+_DIV_CLOSE_RUN_RE = re.compile(r'</div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div>')
+# Spelled with a literal first </div> so the regex engine can jump between candidates
+_DIV_CLOSE_REPEAT_RE = re.compile(r'</div>(?:</div>){9,}')
+# Matches through the last newline of a blank run, so no run of three newlines survives it
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n')
+_PAYMENT_TABLE_RE = re.compile(r'<div><table width="100%" style="border-collapse: collapse"><tbody><tr>.*?<td width="20%"><b><u>Unapplied/Suspense Funds:</u></b></td>.*?<td>\{Money\(\{[M013]\}\)\}</td>.*?</tr></tbody></table></div>', re.DOTALL)
+# Individual payment divs the payment table is turned back into
+_PAYMENT_DIVS = '''<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>
+<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>
+<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>
+<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>
+<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'''
+
+def _format_borrower_table(match):
+    """Replace a table holding the borrower details with the target RE table"""
+    
+    table_content = match.group(0)
+    # Extract the table content and reformat it
+    if 'Borrower Name:' in table_content:
+        return _RE_TABLE_DIV
+    return table_content
+
+def _format_bullet_table(match):
+    """Replace a table holding bullet points with the target two-bullet table"""
+    
+    table_content = match.group(0)
+    if '•' in table_content:
+        return _BULLET_TABLE_DIV
+    return table_content
+
 def apply_comprehensive_spacing(text):
     """Apply comprehensive spacing transformation to fix wall of text issue"""
     
-    # Replace all instances of " <br> " with "\n<br>\n" for proper line breaks
+    # Replace all instances of " <br> " with "\n<br>\n" for proper line breaks; these
+    # literal replaces measure several times faster than one lookaround or callback regex
     text = text.replace(' <br> ', '\n<br>\n')
     text = text.replace('<br> ', '<br>\n')
     text = text.replace(' <br>', '\n<br>')
@@ -990,50 +1421,17 @@ def apply_comprehensive_spacing(text):
     # Pattern: <div><table>...</table></div> with proper indentation
     
     # Fix borrower info table formatting
-    borrower_table_pattern = r'<div><table width="100%" style="border-collapse: collapse"><tbody><tr>.*?</tr></tbody></table>'
-    def format_borrower_table(match):
-        table_content = match.group(0)
-        # Extract the table content and reformat it
-        if 'Borrower Name:' in table_content:
-            return '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="20%"><b>Borrower Name:</b></td>
-  <td>{[M558]}{If('{[M559]}'<>'')} and {[M559]}{End If}</td>
-  </tr><tr>
-  <td width="20%" valign="top"><b>Mailing Address:</b></td>
-  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>
-  </tr><tr>
-  <td width="20%"><b>Mortgage Loan No:</b></td>
-  <td>{[M594]}</td>
-  </tr><tr>
-  <td width="20%"><b>Property Address:</b></td>
-  <td>{Compress({[M567]}|{[M583]})}</td>
-</tr></tbody></table></div>'''
-        return table_content
-    
-    text = re.sub(borrower_table_pattern, format_borrower_table, text, flags=re.DOTALL)
+    text = _BORROWER_TABLE_RE.sub(_format_borrower_table, text)
     
     # Fix bullet point table formatting
-    bullet_table_pattern = r'<div><table width="100%" style="border-collapse: collapse"><tbody><tr>.*?</tr></tbody></table></div>'
-    def format_bullet_table(match):
-        table_content = match.group(0)
-        if '•' in table_content:
-            return '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="3%" valign="top" style="text-align: center">•</td>
-  <td>There may be homeownership assistance options available, and you can reach a {[plsMatrix.CompanyShortName]} Loss Mitigation Specialist at {[plsMatrix.CSPhoneNumber]} to discuss these options.</td>
-  </tr><tr>
-  <td width="3%" valign="top" style="text-align: center">•</td>
-  <td>Avoid Foreclosure Scams: Do your research, make sure you are working with a reputable company. http://www.consumer.ftc.gov/articles/0100-mortgage-relief-scams</td>
-</tr></tbody></table></div>'''
-        return table_content
-    
-    text = re.sub(bullet_table_pattern, format_bullet_table, text, flags=re.DOTALL)
+    text = _BULLET_TABLE_RE.sub(_format_bullet_table, text)
     
     # CRITICAL FIX: Remove excessive duplicate </div> tags
     # This fixes the massive duplication issue at the end of tables
-    text = re.sub(r'</div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div></div>', '</div>', text)
+    text = _DIV_CLOSE_RUN_RE.sub('</div>', text)
     
     # Also fix any other excessive </div> patterns
-    text = re.sub(r'(</div>){10,}', '</div>', text)
+    text = _DIV_CLOSE_REPEAT_RE.sub('</div>', text)
     
     # Fix extra bold tags in the output
     text = text.replace('<b>{[plsMatrix.CSPhoneNumber]}</b>', '{[plsMatrix.CSPhoneNumber]}')
@@ -1041,251 +1439,182 @@ def apply_comprehensive_spacing(text):
     text = text.replace('<b>{[plsMatrix.PayoffAddr1]}, {[plsMatrix.PayoffAddr2]}.</b>', '{[plsMatrix.PayoffAddr1]}, {[plsMatrix.PayoffAddr2]}.')
     
     # Clean up multiple consecutive newlines
-    text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     
     # FINAL FIX: Remove the break between Number of Payments Due and Net Payment Amount
     # This must be the last fix after all spacing transformations
     text = text.replace('<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<br>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>', 
                        '<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>')
     
-    # REMOVE DEBUG MESSAGE
-    text = text.replace('<div style="color: green;">✓ Simple field cleanup worked!</div>', '')
+    # REMOVE DEBUG MESSAGE (only emitted when NC_DEBUG is set)
+    if DEBUG:
+        text = text.replace('<div style="color: green;">✓ Simple field cleanup worked!</div>', '')
     
     # FIX PAYMENT SECTION FORMATTING - Keep as individual divs, not table
     # Remove any table formatting that was incorrectly applied
-    payment_table_pattern = r'<div><table width="100%" style="border-collapse: collapse"><tbody><tr>.*?<td width="20%"><b><u>Unapplied/Suspense Funds:</u></b></td>.*?<td>\{Money\(\{[M013]\}\)\}</td>.*?</tr></tbody></table></div>'
-    
-    payment_div_replacement = '''<div><b><u>Number of Payments Due:</u></b> {[M590]}</div>
-<div><b><u>Net Payment Amount:</u></b> {Money({[M591]})}</div>
-<div><b><u>Unpaid Late Charges:</u></b> {Money({[M015]})}</div>
-<div><b><u>NSF &amp; Other Fees:</u></b> {Math({[M593]} + {[C004]}|Money)}</div>
-<div><b><u>Unapplied/Suspense Funds:</u></b> {Money({[M013]})}</div>'''
-    
-    text = re.sub(payment_table_pattern, payment_div_replacement, text, flags=re.DOTALL)
+    text = _PAYMENT_TABLE_RE.sub(_PAYMENT_DIVS, text)
     
     return text
 
+# Header section bounds, end anchors in priority order
+_TAG_HEADER_LINE_RE = re.compile(r'<div[^>]*>\{\[tagHeader\]\}[^<]*</div>')
+_HEADER_SECTION_END_RE = _anchor_alternation(r'<div[^>]*>', (
+    r'Borrower Name:',
+    r'Dear',
+    r'Notice is hereby given',
+    r'To cure',
+))
+
 def fix_header_structure_completely(text):
     """Completely replace the messy header with clean structure"""
+    if '{[tagHeader]}' not in text:
+        return text
+    
     # Find the start of the document (first tagHeader with any content after it)
     # More flexible pattern to handle {[tagHeader]}(Company Address Line 1)
-    start_match = re.search(r'<div[^>]*>\{\[tagHeader\]\}[^<]*</div>', text)
-    if not start_match:
-        # Try alternative pattern
-        start_match = re.search(r'<div[^>]*>\{\[tagHeader\]\}[^<]*</div>', text)
+    start_match = _TAG_HEADER_LINE_RE.search(text)
     if not start_match:
         return text
     
     # Find where the header section ends (before any borrower info or Dear)
-    end_patterns = [
-        r'<div[^>]*>Borrower Name:',
-        r'<div[^>]*>Dear',
-        r'<div[^>]*>Notice is hereby given',
-        r'<div[^>]*>To cure'
-    ]
-    
-    end_pos = None
-    for pattern in end_patterns:
-        end_match = re.search(pattern, text)
-        if end_match:
-            end_pos = end_match.start()
-            break
+    end_match = _search_anchors(_HEADER_SECTION_END_RE, text)
+    end_pos = end_match.start() if end_match else None
     
     if end_pos:
         # Replace the entire header section
-        clean_header = '''<div>{Insert(H003 TagHeader)}</div>
-<br>
-<div>{[L001]}</div>
-<br>
-<div>{[mailingAddress]}</div>
-<br><br><br><br><br>'''
-        
-        text = text[:start_match.start()] + clean_header + text[end_pos:]
+        text = ''.join((text[:start_match.start()], _HEADER_BLOCK, text[end_pos:]))
     
     return text
 
+# Marks the end of the header block
+_HEADER_BREAKS_RE = re.compile(r'<br><br><br><br><br>')
+
 def add_document_title_and_re_table(text):
     """Add document title and RE table structure"""
     # Add document title after the header
-    header_end = re.search(r'<br><br><br><br><br>', text)
+    header_end = _HEADER_BREAKS_RE.search(text)
     if header_end:
         insert_pos = header_end.end()
         
-        title_html = '''<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>
-<br>'''
-        
-        re_table_html = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="20%"><b>Borrower Name:</b></td>
-  <td>{[M558]}{If('{[M559]}'&lt;&gt;'')} and {[M559]}{End If}</td>
-  </tr><tr>
-  <td width="20%" valign="top"><b>Mailing Address:</b></td>
-  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>
-  </tr><tr>
-  <td width="20%"><b>Mortgage Loan No:</b></td>
-  <td>{[M594]}</td>
-  </tr><tr>
-  <td width="20%"><b>Property Address:</b></td>
-  <td>{Compress({[M567]}|{[M583]})}</td>
-</tr></tbody></table></div>
-<br>'''
-        
-        text = text[:insert_pos] + title_html + re_table_html + text[insert_pos:]
+        text = ''.join((text[:insert_pos], _DOCUMENT_TITLE, '\n<br>', _RE_TABLE_ESCAPED_DIV, '\n<br>', text[insert_pos:]))
     
     return text
 
+# Salutation section bounds, end anchors in priority order
+_DEAR_START_RE = re.compile(r'<div[^>]*>Dear')
+_SALUTATION_END_ANCHORS = (
+    r'Notice is hereby given',
+    r'To cure',
+    r'You are required',
+)
+_SALUTATION_END_RE = _anchor_alternation(r'<div[^>]*>', _SALUTATION_END_ANCHORS)
+
 def fix_salutation_section(text):
     """Fix the salutation section to show only one clean salutation"""
+    # A plain substring check skips the regex scans when there is no salutation at all
+    if 'Dear' not in text:
+        return text
+    
     # Find the first Dear and remove all the multiple options
-    dear_start = re.search(r'<div[^>]*>Dear', text)
+    dear_start = _DEAR_START_RE.search(text)
     if dear_start:
         # Find where the salutation section ends
-        end_patterns = [
-            r'<div[^>]*>Notice is hereby given',
-            r'<div[^>]*>To cure',
-            r'<div[^>]*>You are required'
-        ]
-        
-        end_pos = None
-        for pattern in end_patterns:
-            end_match = re.search(pattern, text)
-            if end_match:
-                end_pos = end_match.start()
-                break
+        end_match = _search_anchors(_SALUTATION_END_RE, text)
+        end_pos = end_match.start() if end_match else None
         
         if end_pos:
             # Replace all the Dear options with a clean salutation
-            clean_salutation = '<div>Dear {[Salutation]},</div>\n<br>'
-            text = text[:dear_start.start()] + clean_salutation + text[end_pos:]
+            text = ''.join((text[:dear_start.start()], _CLEAN_SALUTATION, text[end_pos:]))
     
     return text
 
+# Payment information section bounds, end anchors in priority order
+_PAYMENT_INFO_START_RE = re.compile(r'<div[^>]*>Number of Payments Due:')
+_PAYMENT_INFO_END_RE = _anchor_alternation(r'<div[^>]*>', (
+    r'If you do not cure',
+    r'You should realize',
+    r'Please consider',
+))
+
 def fix_payment_information(text):
     """Fix payment information to be in a proper table"""
+    if 'Number of Payments Due:' not in text:
+        return text
+    
     # Find the payment information section
-    payment_start = re.search(r'<div[^>]*>Number of Payments Due:', text)
+    payment_start = _PAYMENT_INFO_START_RE.search(text)
     if payment_start:
         # Find where this section ends
-        end_patterns = [
-            r'<div[^>]*>If you do not cure',
-            r'<div[^>]*>You should realize',
-            r'<div[^>]*>Please consider'
-        ]
-        
-        end_pos = None
-        for pattern in end_patterns:
-            end_match = re.search(pattern, text)
-            if end_match:
-                end_pos = end_match.start()
-                break
+        end_match = _search_anchors(_PAYMENT_INFO_END_RE, text)
+        end_pos = end_match.start() if end_match else None
         
         if end_pos:
             # Create clean payment table
-            payment_table = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="50%">Number of Payments Due:</td>
-  <td>{[M590]}</td>
-  </tr><tr>
-  <td width="50%">Net Payment Amount:</td>
-  <td>{Money}</td>
-  </tr><tr>
-  <td width="50%">Unpaid Late Charges:</td>
-  <td>{Money}</td>
-  </tr><tr>
-  <td width="50%">NSF & Other Fees:</td>
-  <td>{Money} + {Money}</td>
-  </tr><tr>
-  <td width="50%">Unapplied/Suspense Funds:</td>
-  <td>{Money}</td>
-</tr></tbody></table></div>
-<br>'''
+            payment_table = _PAYMENT_TABLE_DIV + '\n<br>'
             
-            text = text[:payment_start.start()] + payment_table + text[end_pos:]
+            text = ''.join((text[:payment_start.start()], payment_table, text[end_pos:]))
     
     return text
 
+# Fields that need plsMatrix prefix, matched together in one pass
+_PLS_MATRIX_FIELDS = (
+    'CSPhoneNumber', 'SPOCContactEmail', 'PayoffAddr1', 'PayoffAddr2',
+    'CompanyShortName', 'CompanyLongName', 'CashMgmtDept', 'LossMitHrs',
+    'LoanCounselingPh', 'SeeReverse'
+)
+_PLS_MATRIX_FIELD_RE = re.compile(r'\{\[(' + '|'.join(_PLS_MATRIX_FIELDS) + r')\]\}')
+
 def add_pls_matrix_prefixes(text):
     """Add plsMatrix. prefixes to specific fields"""
-    # Fields that need plsMatrix prefix
-    pls_matrix_fields = [
-        'CSPhoneNumber', 'SPOCContactEmail', 'PayoffAddr1', 'PayoffAddr2',
-        'CompanyShortName', 'CompanyLongName', 'CashMgmtDept', 'LossMitHrs',
-        'LoanCounselingPh', 'SeeReverse'
-    ]
-    
-    for field in pls_matrix_fields:
-        text = re.sub(r'\{\[' + field + r'\]\}', r'{[plsMatrix.' + field + ']}', text)
-    
-    return text
+    return _PLS_MATRIX_FIELD_RE.sub(r'{[plsMatrix.\1]}', text)
+
+# Field names split around bold tags, like {<b>M558}</b> or {<b>M558</b><b>}
+_BOLD_WRAPPED_FIELD_RE = re.compile(r'\{<b>([A-Z]\d+[A-Z]?E?\d*)(?:\}</b>|</b><b>\})')
+
+# Specific broken patterns we see in the output, and header fields converted to the correct format
+_FIELD_NAME_REPLACEMENTS = [
+    ('<b>{</b><b>[M558]}</b>', '{[M558]}'),
+    ('{[H002]}', '{Insert(H003 TagHeader)}'),
+    ('{[H003]}', '{Insert(H003 TagHeader)}'),
+    ('{[H004]}', '{Insert(H003 TagHeader)}'),
+    ('{[L001E8]}', '{[L001]}'),
+    ('<b>{</b><b>[M559]}</b>', '{[M559]}'),
+    ('<b>{</b><b>[M594]}</b>', '{[M594]}'),
+    ('<b>{</b><b>[M561]}</b>', '{[M561]}'),
+    ('<b>{</b><b>[M562]}</b>', '{[M562]}'),
+    ('<b>{</b><b>[M563]}</b>', '{[M563]}'),
+    ('<b>{</b><b>[M564]}</b>', '{[M564]}'),
+    ('<b>{</b><b>[M565]}</b>', '{[M565]}'),
+    ('<b>{</b><b>[M566]}</b>', '{[M566]}'),
+    ('<b>{</b><b>[M567]}</b>', '{[M567]}'),
+    ('<b>{</b><b>[M583]}</b>', '{[M583]}'),
+    ('<b>{</b><b>[M568]}</b>', '{[M568]}')
+]
+_FIELD_NAME_RE, _FIELD_NAME_MAP = _compile_replacements(_FIELD_NAME_REPLACEMENTS)
+
+# Field formats converted to standard {[field]} format, in order
+_FIELD_FORMAT_RES = (
+    (re.compile(r'\{Insert\(([^}]+)\)\}'), r'{[tagHeader]}'),
+    (re.compile(r'\{([A-Z0-9]+)\}'), r'{\[\1\]}'),  # {FIELD} -> {[FIELD]}, {FIELDE1} -> {[FIELDE1]}
+    # Pattern for {[fieldname}](description), with or without a space before the parentheses
+    (re.compile(r'\{\[([A-Za-z0-9]+)\}\]\s*\([^)]*\)'), r'{[\1]}'),
+)
+
+# Descriptive text in parentheses after a field name, removed by fix_field_names
+_FIELD_DESCRIPTION_RE = re.compile(r'(\{\[[A-Za-z0-9]+\]\})\s*\([^)]*\)')
 
 def fix_field_names(text):
     """Convert field names to standard format"""
-    # Fix broken field names like {[M558]} that got split into {[M558]}
-    text = re.sub(r'\{<b>([A-Z]\d+[A-Z]?E?\d*)\}</b>', r'{[\1]}', text)
-    text = re.sub(r'\{<b>([A-Z]\d+[A-Z]?)\}</b>', r'{[\1]}', text)
-    
-    # Fix field names that got split across tags
-    text = re.sub(r'\{<b>([A-Z]\d+[A-Z]?E?\d*)</b><b>\}', r'{[\1]}', text)
-    
-    # Fix specific broken patterns we see in the output
-    text = re.sub(r'<b>\{</b><b>\[M558\]\}</b>', '{[M558]}', text)
-    
-    # Convert specific header fields to the correct format
-    text = re.sub(r'\{\[H002\]\}', '{Insert(H003 TagHeader)}', text)
-    text = re.sub(r'\{\[H003\]\}', '{Insert(H003 TagHeader)}', text)
-    text = re.sub(r'\{\[H004\]\}', '{Insert(H003 TagHeader)}', text)
-    text = re.sub(r'\{\[L001E8\]\}', '{[L001]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M559\]\}</b>', '{[M559]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M594\]\}</b>', '{[M594]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M561\]\}</b>', '{[M561]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M562\]\}</b>', '{[M562]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M563\]\}</b>', '{[M563]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M564\]\}</b>', '{[M564]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M565\]\}</b>', '{[M565]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M566\]\}</b>', '{[M566]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M567\]\}</b>', '{[M567]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M583\]\}</b>', '{[M583]}', text)
-    text = re.sub(r'<b>\{</b><b>\[M568\]\}</b>', '{[M568]}', text)
-    
-    # Convert various field formats to standard {[field]} format
-    text = re.sub(r'\{Insert\(([^}]+)\)\}', r'{[tagHeader]}', text)
-    text = re.sub(r'\{([A-Z0-9]+)\}', r'{\[\1\]}', text)  # {FIELD} -> {[FIELD]}
-    text = re.sub(r'\{([A-Z0-9]+E[0-9]+)\}', r'{\[\1\]}', text)  # {FIELDE1} -> {[FIELDE1]}
-    
-    # Clean up field names with descriptive text in parentheses - simpler approach
-    # Use a more direct pattern that should work reliably
-    
-    # Pattern for {[fieldname]}(description) - no space before parentheses
-    # Use a more direct approach - find the pattern and replace it
-    text = re.sub(r'\{\[([A-Za-z0-9]+)\}\]\([^)]*\)', r'{[\1]}', text)
-    
-    # Pattern for {[fieldname]} (description) - with space before parentheses  
-    text = re.sub(r'\{\[([A-Za-z0-9]+)\}\]\s+\([^)]*\)', r'{[\1]}', text)
-    
-    # Debug: Let's try a completely different approach - string replacement
-    # Replace specific patterns we know exist
-    text = text.replace('{[tagHeader]}(Company Address Line 1)', '{[tagHeader]}')
-    text = text.replace('{[tagHeader]}(Company Address Line 2)', '{[tagHeader]}')
-    text = text.replace('{[tagHeader]}(Company Address Line 3)', '{[tagHeader]}')
-    text = text.replace('{[L001]} (System Date)', '{[L001]}')
-    text = text.replace('{[M558]}(New Bill Line 1/ Mortgagor Name)', '{[M558]}')
-    text = text.replace('{[M559]} (New Bill Line 2/Second Mortgagor)', '{[M559]}')
-    text = text.replace('{[M560]} (New Bill Line 3/Third Mortgagor)', '{[M560]}')
-    text = text.replace('{[M561]} (Additional Mailing Address)', '{[M561]}')
-    text = text.replace('{[M562]} (Mailing Street Address)', '{[M562]}')
-    text = text.replace('{[M594]}(Loan Number – No Dash)', '{[M594]}')
-    text = text.replace('{[M567]} (Property Line 1/Street Address)', '{[M567]}')
-    text = text.replace('{[M583]}(New Property Unit Number)', '{[M583]}')
-    text = text.replace('{[M568]} (New Property Line 2/City State and Zip Code)', '{[M568]}')
-    text = text.replace('{[M590]}(Delinquent Payment Count)', '{[M590]}')
-    text = text.replace('{[U027]} (Late Fee Date)', '{[U027]}')
-    text = text.replace('{[L008E8]} (Last Day This Month)', '{[L008E8]}')
-    text = text.replace('{[L011E8]} (Today Plus 30 Days)', '{[L011E8]}')
-    text = text.replace('{[M956]} (Foreign Address Indicator = 1)', '{[M956]}')
-    text = text.replace('{[M928]} (Foreign Country Code)', '{[M928]}')
-    text = text.replace('{[M929]} (Foreign Postal Code)', '{[M929]}')
-    
-    # Debug output to see if function is working
-    if 'tagHeader' in text:
+    text = _BOLD_WRAPPED_FIELD_RE.sub(r'{[\1]}', text)
+    text = _apply_replacements(text, _FIELD_NAME_RE, _FIELD_NAME_MAP)
+    for pattern, replacement in _FIELD_FORMAT_RES:
+        text = pattern.sub(replacement, text)
+    
+    # Remove the descriptive text left after any field, e.g. {[L001]} (System Date)
+    text = _FIELD_DESCRIPTION_RE.sub(r'\1', text)
+    
+    # Debug output to see if function is working (set NC_DEBUG to enable)
+    if DEBUG and 'tagHeader' in text:
         # Check if string replacements worked
         if '(Company Address Line 1)' in text:
             text = '<div style="color: red;">❌ String replacements did NOT work - still has (Company Address Line 1)</div>' + text
@@ -1294,59 +1623,46 @@ def fix_field_names(text):
     
     return text
 
+# Header field lines, Notice of Intention title and the fallback end anchors used by
+# create_clean_header_structure, each list in priority order
+_HEADER_FIELD_LINE_RE = _anchor_alternation(r'<div[^>]*>', (
+    r'\{\[tagHeader\]\}[^<]*</div>',
+    r'\{[H0-9]+\}[^<]*</div>',
+    r'\{[L0-9]+\}[^<]*</div>',
+))
+_NOTICE_OF_INTENTION_RE = re.compile(r'<div[^>]*>Notice of Intention')
+_HEADER_FALLBACK_END_RE = _anchor_alternation(r'<div[^>]*>', (
+    r'Notice of Default',
+    r'Dear',
+    r'To cure',
+    r'You are required',
+))
+
 def create_clean_header_structure(text):
     """Create clean header structure following universal pattern"""
-    # Universal header pattern from analysis
-    header_html = '''<div>{Insert(H003 TagHeader)}</div>
-<br>
-<div>{[L001]}</div>
-<br>
-<div>{[mailingAddress]}</div>
-<br><br><br><br><br>'''
-    
     # Find the start of the messy header and replace everything until "Notice of Intention"
     # Look for the first occurrence of any header field
-    header_patterns = [
-        r'<div[^>]*>\{\[tagHeader\]\}[^<]*</div>',
-        r'<div[^>]*>\{[H0-9]+\}[^<]*</div>',
-        r'<div[^>]*>\{[L0-9]+\}[^<]*</div>'
-    ]
-    
-    start_pos = None
-    for pattern in header_patterns:
-        match = re.search(pattern, text)
-        if match:
-            start_pos = match.start()
-            break
+    match = _search_anchors(_HEADER_FIELD_LINE_RE, text)
+    start_pos = match.start() if match else None
     
     if start_pos is not None:
         # Find where the header section ends (before "Notice of Intention")
-        notice_start = re.search(r'<div[^>]*>Notice of Intention', text)
+        notice_start = _NOTICE_OF_INTENTION_RE.search(text)
         if notice_start:
             # Replace the entire messy header section
             end_pos = notice_start.start()
-            text = text[:start_pos] + header_html + text[end_pos:]
+            text = ''.join((text[:start_pos], _HEADER_BLOCK, text[end_pos:]))
         else:
             # If no "Notice of Intention" found, look for other document title patterns
-            title_patterns = [
-                r'<div[^>]*>Notice of Default',
-                r'<div[^>]*>Dear',
-                r'<div[^>]*>To cure',
-                r'<div[^>]*>You are required'
-            ]
-            for pattern in title_patterns:
-                match = re.search(pattern, text)
-                if match:
-                    end_pos = match.start()
-                    text = text[:start_pos] + header_html + text[end_pos:]
-                    break
+            match = _search_anchors(_HEADER_FALLBACK_END_RE, text)
+            if match:
+                end_pos = match.start()
+                text = ''.join((text[:start_pos], _HEADER_BLOCK, text[end_pos:]))
     
     return text
 
-def create_proper_header(text):
-    """Create proper header structure with company info and date"""
-    # Create header section
-    header_html = '''<div>{[tagHeader]}</div>
+# Header with company info and right-aligned date
+_PROPER_HEADER_BLOCK = '''<div>{[tagHeader]}</div>
 <br>
 <div style="text-align: right">{[L001E8]}</div>
 <br>
@@ -1356,7 +1672,9 @@ def create_proper_header(text):
 <br>
 <br>
 <br>'''
-    
+
+def create_proper_header(text):
+    """Create proper header structure with company info and date"""
     # Look for the header pattern - find where the current header starts
     header_start = text.find('{[tagHeader]}')
     if header_start != -1:
@@ -1364,76 +1682,53 @@ def create_proper_header(text):
         notice_start = text.find('Notice of Intention to Foreclose Mortgage')
         if notice_start != -1:
             # Replace the messy header section with proper structure
-            text = text[:header_start] + header_html + text[notice_start:]
+            text = ''.join((text[:header_start], _PROPER_HEADER_BLOCK, text[notice_start:]))
     
     return text
 
+# Document titles, scattered borrower lines and the anchors ending them, as searched
+# by create_universal_re_table in priority order
+_TITLE_LINE_RE = _anchor_alternation(r'<div[^>]*>', (
+    r'Notice of Intention to Foreclose Mortgage[^<]*</div>',
+    r'Notice of Default[^<]*</div>',
+    r'Notice of Breach[^<]*</div>',
+))
+_BORROWER_INFO_START_RE = _anchor_alternation(r'<div>', (
+    r'<b>Borrower Name:',
+    r'Borrower Name:',
+    r'<b>Mortgage Loan No:',
+    r'Mortgage Loan No:',
+    r'<b>Property Address:',
+    r'Property Address:',
+))
+_BORROWER_INFO_END_RE = _anchor_alternation(r'<div>', (
+    r'Dear \{[Salutation]\}',
+    r'Dear \{',
+    r'Notice is hereby given',
+    r'To cure',
+    r'You are required',
+))
+
 def create_universal_re_table(text):
     """Create universal RE table structure based on analysis"""
-    # Universal RE table pattern from BR008 analysis
-    re_table_html = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
-  <td width="20%"><b>Borrower Name:</b></td>
-  <td>{[M558]}{If('{[M559]}'&lt;&gt;'')} and {[M559]}{End If}</td>
-  </tr><tr>
-  <td width="20%" valign="top"><b>Mailing Address:</b></td>
-  <td>{Compress({[M561]}|{[M562]}|{[M563]}{[M564]}{[M565]}{[M566]})}</td>
-  </tr><tr>
-  <td width="20%"><b>Mortgage Loan No:</b></td>
-  <td>{[M594]}</td>
-  </tr><tr>
-  <td width="20%"><b>Property Address:</b></td>
-  <td>{Compress({[M567]}|{[M583]})}</td>
-</tr></tbody></table></div>'''
+    # Every title starts with "Notice of", so there is nothing to do without one
+    if 'Notice of ' not in text:
+        return text
     
     # Find the document title and insert RE table after it
-    title_patterns = [
-        r'<div[^>]*>Notice of Intention to Foreclose Mortgage[^<]*</div>',
-        r'<div[^>]*>Notice of Default[^<]*</div>',
-        r'<div[^>]*>Notice of Breach[^<]*</div>'
-    ]
-    
-    title_match = None
-    for pattern in title_patterns:
-        title_match = re.search(pattern, text)
-        if title_match:
-            break
+    title_match = _search_anchors(_TITLE_LINE_RE, text)
     
     if title_match:
         # Insert RE table right after the title
         insert_pos = title_match.end()
-        text = text[:insert_pos] + '<br>' + re_table_html + '<br>' + text[insert_pos:]
+        text = ''.join((text[:insert_pos], '<br>', _RE_TABLE_ESCAPED_DIV, '<br>', text[insert_pos:]))
         
         # Now remove the scattered borrower info that appears later
-        borrower_patterns = [
-            r'<div><b>Borrower Name:',
-            r'<div>Borrower Name:',
-            r'<div><b>Mortgage Loan No:',
-            r'<div>Mortgage Loan No:',
-            r'<div><b>Property Address:',
-            r'<div>Property Address:'
-        ]
-        
-        borrower_start = None
-        for pattern in borrower_patterns:
-            borrower_start = re.search(pattern, text)
-            if borrower_start:
-                break
+        borrower_start = _search_anchors(_BORROWER_INFO_START_RE, text)
         
         if borrower_start:
             # Find where this section ends (before "Dear" or main content)
-            dear_patterns = [
-                r'<div>Dear \{[Salutation]\}',
-                r'<div>Dear \{',
-                r'<div>Notice is hereby given',
-                r'<div>To cure',
-                r'<div>You are required'
-            ]
-            
-            dear_start = None
-            for pattern in dear_patterns:
-                dear_start = re.search(pattern, text)
-                if dear_start:
-                    break
+            dear_start = _search_anchors(_BORROWER_INFO_END_RE, text)
             
             if dear_start:
                 # Remove the scattered borrower info
@@ -1443,83 +1738,89 @@ def create_universal_re_table(text):
     
     return text
 
-def create_re_table_structure(text):
-    """Create RE table structure"""
-    # Create RE table
-    re_table_html = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
+# Loan number and property address RE table
+_LOAN_RE_TABLE_DIV = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
   <td width="20%">RE: Loan No:</td>
   <td>{[M594]}</td>
   </tr><tr>
   <td width="20%" valign="top">Property Address:</td>
   <td>{Compress({[M567]}|{[M583]}|{[M568]})}</td>
 </tr></tbody></table></div>'''
-    
+
+def create_re_table_structure(text):
+    """Create RE table structure"""
     # Find where to insert the RE table - after the document title
     title_end = text.find('Notice of Intention to Foreclose Mortgage</b></div>')
     if title_end != -1:
         # Insert RE table after the title
         insert_point = title_end + len('Notice of Intention to Foreclose Mortgage</b></div>')
-        text = text[:insert_point] + '<br>' + re_table_html + '<br>' + text[insert_point:]
+        text = ''.join((text[:insert_point], '<br>', _LOAN_RE_TABLE_DIV, '<br>', text[insert_point:]))
     
     return text
 
+# Universal title pattern: centered and bold
+_UNIVERSAL_TITLE_TEXTS = (
+    'Notice of Intention to Foreclose Mortgage',
+    'Notice of Default and Right to Cure',
+    'Notice of Default and Cure Letter',
+    'Notice of Breach'
+)
+# Any of the titles, found in one prefix-factored search
+_UNIVERSAL_TITLE_RE = re.compile(_trie_regex(_UNIVERSAL_TITLE_TEXTS))
+# Each title's whole-line pattern and its centered replacement
+_UNIVERSAL_TITLE_LINES = tuple(
+    (
+        re.compile(rf'<div[^>]*>{re.escape(title)}[^<]*</div>'),
+        f'<div style="text-align: center"><b>{title}</b></div>',
+    )
+    for title in _UNIVERSAL_TITLE_TEXTS
+)
+# Content hints used to pick a title when none exists, and the end of the RE table
+_FORECLOSURE_RE = re.compile(r'foreclose|foreclosure', re.IGNORECASE)
+_DEFAULT_CURE_RE = re.compile(r'default.*cure|cure.*default', re.IGNORECASE)
+_TABLE_DIV_END_RE = re.compile(r'</tbody></table></div>')
+
 def format_document_title_universal(text):
     """Format document title following universal pattern"""
-    # Universal title pattern: centered and bold
-    title_patterns = [
-        r'Notice of Intention to Foreclose Mortgage',
-        r'Notice of Default and Right to Cure',
-        r'Notice of Default and Cure Letter',
-        r'Notice of Breach'
-    ]
-    
-    # Check if any title already exists
-    title_exists = False
-    for pattern in title_patterns:
-        if re.search(pattern, text):
-            title_exists = True
-            break
-    
     # If no title exists, add one based on document content
-    if not title_exists:
+    if not _UNIVERSAL_TITLE_RE.search(text):
         # Look for foreclosure-related content to determine title
-        if re.search(r'foreclose|foreclosure', text, re.IGNORECASE):
+        if _FORECLOSURE_RE.search(text):
             title_html = '<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>'
-        elif re.search(r'default.*cure|cure.*default', text, re.IGNORECASE):
+        elif _DEFAULT_CURE_RE.search(text):
             title_html = '<div style="text-align: center"><b>Notice of Default and Right to Cure</b></div>'
         else:
             title_html = '<div style="text-align: center"><b>Notice of Default</b></div>'
         
         # Insert title after the RE table or at the beginning of main content
-        re_table_end = re.search(r'</tbody></table></div>', text)
+        re_table_end = _TABLE_DIV_END_RE.search(text)
         if re_table_end:
             insert_pos = re_table_end.end()
-            text = text[:insert_pos] + '<br>' + title_html + '<br>' + text[insert_pos:]
+            text = ''.join((text[:insert_pos], '<br>', title_html, '<br>', text[insert_pos:]))
         else:
             # Insert at the beginning of main content
-            main_content_start = re.search(r'<div[^>]*>Dear', text)
+            main_content_start = _DEAR_START_RE.search(text)
             if main_content_start:
                 insert_pos = main_content_start.start()
-                text = text[:insert_pos] + title_html + '<br>' + text[insert_pos:]
+                text = ''.join((text[:insert_pos], title_html, '<br>', text[insert_pos:]))
     
-    # Format existing titles
-    for pattern in title_patterns:
-        # Find and replace with universal centered format
-        escaped_pattern = re.escape(pattern)
-        text = re.sub(rf'<div[^>]*>{escaped_pattern}[^<]*</div>',
-                     f'<div style="text-align: center"><b>{pattern}</b></div>', text)
+    # Format existing titles, replacing them with the universal centered format
+    for title_line, centered_title in _UNIVERSAL_TITLE_LINES:
+        text = title_line.sub(centered_title, text)
     
     return text
 
+# Title line variants normalized by format_document_title
+_BOLD_TITLE_END_RE = re.compile(r'Notice of Intention to Foreclose Mortgage</b></div>')
+_PLAIN_TITLE_LINE_RE = re.compile(r'<div[^>]*>Notice of Intention to Foreclose Mortgage</div>')
+
 def format_document_title(text):
     """Format the main document title"""
     # Fix the title that's currently embedded in the header div
-    text = re.sub(r'Notice of Intention to Foreclose Mortgage</b></div>', 
-                  'Notice of Intention to Foreclose Mortgage</b></div>', text)
+    text = _BOLD_TITLE_END_RE.sub('Notice of Intention to Foreclose Mortgage</b></div>', text)
     
     # Also handle the case where it's in a regular div
-    text = re.sub(r'<div[^>]*>Notice of Intention to Foreclose Mortgage</div>', 
-                  '<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>', text)
+    text = _PLAIN_TITLE_LINE_RE.sub('<div style="text-align: center"><b>Notice of Intention to Foreclose Mortgage</b></div>', text)
     
     return text
 
@@ -1528,45 +1829,43 @@ def create_borrower_table(text):
     # This would create a table for borrower info if needed
     return text
 
+# Salutation starts and option-list end anchors in priority order, and the leftover
+# Dear lines removed by the salutation formatters
+_DEAR_RES = (
+    _DEAR_START_RE,
+    re.compile(r'Dear'),
+)
+_SALUTATION_OPTIONS_END_RE = _anchor_alternation(r'<div[^>]*>', _SALUTATION_END_ANCHORS + (
+    r'This notice',
+    r'We are writing',
+))
+_DUPLICATE_DEAR_RE = re.compile(r'<div[^>]*>Dear[^<]*</div>\s*<br>\s*<div[^>]*></div>\s*<br>\s*')
+
 def format_salutation_universal(text):
     """Format salutation following universal pattern"""
-    # Find the first "Dear" and replace all multiple options with clean salutation
-    dear_patterns = [
-        r'<div[^>]*>Dear',
-        r'<div>Dear',
-        r'Dear'
-    ]
+    # Every pattern below needs a Dear
+    if 'Dear' not in text:
+        return text
     
+    # Find the first "Dear" and replace all multiple options with clean salutation
     dear_start = None
-    for pattern in dear_patterns:
-        dear_start = re.search(pattern, text)
+    for pattern in _DEAR_RES:
+        dear_start = pattern.search(text)
         if dear_start:
             break
     
     if dear_start:
         # Find where all the Dear options end (before main content)
-        end_patterns = [
-            r'<div[^>]*>Notice is hereby given',
-            r'<div[^>]*>To cure',
-            r'<div[^>]*>You are required',
-            r'<div[^>]*>This notice',
-            r'<div[^>]*>We are writing'
-        ]
-        
-        end_pos = None
-        for pattern in end_patterns:
-            end_match = re.search(pattern, text)
-            if end_match:
-                end_pos = end_match.start()
-                break
+        end_match = _search_anchors(_SALUTATION_OPTIONS_END_RE, text)
+        end_pos = end_match.start() if end_match else None
         
         if end_pos:
             # Replace all the Dear options with a clean salutation
             salutation_html = '<div>Dear {[Salutation]},</div>'
-            text = text[:dear_start.start()] + salutation_html + text[end_pos:]
+            text = ''.join((text[:dear_start.start()], salutation_html, text[end_pos:]))
     
     # Also clean up any remaining broken Dear patterns
-    text = re.sub(r'<div[^>]*>Dear[^<]*</div>\s*<br>\s*<div[^>]*></div>\s*<br>\s*', '', text)
+    text = _DUPLICATE_DEAR_RE.sub('', text)
     
     return text
 
@@ -1580,39 +1879,41 @@ def format_salutation(text):
         if notice_start != -1:
             # Replace all the Dear options with a clean salutation
             salutation_html = '<div>Dear {[Salutation]},</div>'
-            text = text[:dear_start] + salutation_html + text[notice_start:]
+            text = ''.join((text[:dear_start], salutation_html, text[notice_start:]))
     
     # Also handle cases where Dear appears multiple times in sequence
     # Remove all the duplicate Dear lines
-    text = re.sub(r'<div[^>]*>Dear[^<]*</div>\s*<br>\s*<div[^>]*></div>\s*<br>\s*', '', text)
+    text = _DUPLICATE_DEAR_RE.sub('', text)
     
     return text
 
+# Money fields wrapped by wrap_money_fields, in order
+_MONEY_FIELD_RES = (
+    # Individual money fields with E6 suffix (with or without descriptive text)
+    re.compile(r'\$\{\[([A-Z0-9]+E6)\]\}\s*\([^)]*\)'),
+    re.compile(r'\$\{\[([A-Z0-9]+E6)\]\}\([^)]*\)'),
+    re.compile(r'\$\{\[([A-Z0-9]+E6)\]\}'),
+    # E6 fields without $ signs but with descriptive text
+    re.compile(r'\{\[([A-Z0-9]+E6)\]\}\s*\([^)]*\)'),
+    re.compile(r'\{\[([A-Z0-9]+E6)\]\}\([^)]*\)'),
+    # Regular fields that appear to be money (with $ signs and descriptive text)
+    re.compile(r'\$\{\[([A-Z0-9]+)\]\}\s*\([^)]*\)'),
+    re.compile(r'\$\{\[([A-Z0-9]+)\]\}\([^)]*\)'),
+)
+
 def wrap_money_fields(text):
     """Wrap money fields in Money() and Math() functions"""
-    # Wrap individual money fields with E6 suffix (with or without descriptive text)
-    text = re.sub(r'\$\{\[([A-Z0-9]+E6)\]\}\s*\([^)]*\)', r'{Money({\[\1\]})}', text)
-    text = re.sub(r'\$\{\[([A-Z0-9]+E6)\]\}\([^)]*\)', r'{Money({\[\1\]})}', text)
-    text = re.sub(r'\$\{\[([A-Z0-9]+E6)\]\}', r'{Money({\[\1\]})}', text)
-    
-    # Wrap E6 fields without $ signs but with descriptive text
-    text = re.sub(r'\{\[([A-Z0-9]+E6)\]\}\s*\([^)]*\)', r'{Money({\[\1\]})}', text)
-    text = re.sub(r'\{\[([A-Z0-9]+E6)\]\}\([^)]*\)', r'{Money({\[\1\]})}', text)
+    for pattern in _MONEY_FIELD_RES:
+        text = pattern.sub(r'{Money({\[\1\]})}', text)
     
-    # Wrap regular fields that appear to be money (with $ signs and descriptive text)
-    text = re.sub(r'\$\{\[([A-Z0-9]+)\]\}\s*\([^)]*\)', r'{Money({\[\1\]})}', text)
-    text = re.sub(r'\$\{\[([A-Z0-9]+)\]\}\([^)]*\)', r'{Money({\[\1\]})}', text)
-    
-    # Debug output
-    if 'E6' in text:
+    # Debug output (set NC_DEBUG to enable)
+    if DEBUG and 'E6' in text:
         text = '<div style="color: blue;">✓ Money function is running</div>' + text
     
     return text
 
-def create_payment_info_tables(text):
-    """Create payment information tables"""
-    # Create payment breakdown table
-    payment_table_html = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
+# Payment breakdown table with the money fields filled in
+_PAYMENT_BREAKDOWN_TABLE_DIV = '''<div><table width="100%" style="border-collapse: collapse"><tbody><tr>
   <td width="50%">Number of Payments Due:</td>
   <td>{[M590]}</td>
   </tr><tr>
@@ -1628,7 +1929,9 @@ def create_payment_info_tables(text):
   <td width="50%">Unapplied/Suspense Funds:</td>
   <td>{Money({[M013E6]})}</td>
 </tr></tbody></table></div>'''
-    
+
+def create_payment_info_tables(text):
+    """Create payment information tables"""
     # Find the payment info section - look for the table that's embedded in text
     table_start = text.find('<div><table width="100%" style="border-collapse: collapse"><tbody><tr>')
     if table_start != -1:
@@ -1636,7 +1939,7 @@ def create_payment_info_tables(text):
         table_end = text.find('</table></div>', table_start) + len('</table></div>')
         if table_end != -1:
             # Replace the embedded table with proper formatting
-            text = text[:table_start] + payment_table_html + text[table_end:]
+            text = ''.join((text[:table_start], _PAYMENT_BREAKDOWN_TABLE_DIV, text[table_end:]))
     
     # Also handle the case where payment info is in regular text
     payment_start = text.find('Number of Payments Due:')
@@ -1645,75 +1948,107 @@ def create_payment_info_tables(text):
         cure_start = text.find('If you do not cure the default')
         if cure_start != -1:
             # Replace the payment info section with table
-            text = text[:payment_start] + payment_table_html + text[cure_start:]
+            text = ''.join((text[:payment_start], _PAYMENT_BREAKDOWN_TABLE_DIV, text[cure_start:]))
     
     return text
 
+# Duplicate payment information lines repeated after the payment table, first and last
+_DUPLICATE_PAYMENT_START = '<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b><b> </b></div>'
+_DUPLICATE_PAYMENT_END = '<div><u><b>Unapplied/Suspense Funds: </b></u><b>$</b><b>{Money} </b></div>'
+
+def _remove_duplicate_payment_info(text):
+    """Remove each block from a duplicate payment-count line through the next suspense-funds line"""
+    # Two plain finds per block instead of a DOTALL regex that can backtrack across the document
+    parts = []
+    pos = 0
+    while True:
+        start = text.find(_DUPLICATE_PAYMENT_START, pos)
+        if start == -1:
+            break
+        end = text.find(_DUPLICATE_PAYMENT_END, start + len(_DUPLICATE_PAYMENT_START))
+        if end == -1:
+            break
+        parts.append(text[pos:start])
+        pos = end + len(_DUPLICATE_PAYMENT_END)
+    
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+# Style and tag artifacts removed by clean_excessive_formatting; the plain literals
+# (doubled justify, split and empty bold tags, empty divs) go through str.replace
+_JUSTIFY_RUN_RE = re.compile(r'(text-align: justify; )+')
+_FONT_SIZE_RUN_RE = re.compile(r'(font-size: [^;]+; )+')
+_JUSTIFIED_DIV_RE = re.compile(r'<div style="text-align: justify">(?:<b>)?')
+_PAYMENTS_DUE_BREAK_RE = re.compile(r'Number of Payments Due:</u></b> \{[M590]\}</div>\s*<br>\s*<div><b><u>Net Payment Amount:')
+_BOLD_FIELD_RE = re.compile(r'<b>(\{[^}]+\})</b>')
+_FIELD_BOLD_CLOSE_RE = re.compile(r'(\{[^}]+\})\s*</b>')
+_ORPHAN_BOLD_CLOSE_RE = re.compile(r'([^<])\s*</b>')
+_UNCLOSED_BOLD_RE = re.compile(r'<b>([^<]+)</div>')
+_SPLIT_FIELD_RE = re.compile(r'\{</b><b>([^}]+)</b><b>\}')
+
 def clean_excessive_formatting(text):
     """Remove excessive formatting that doesn't match universal patterns"""
     # Remove repeated style attributes (like "text-align: justify; text-align: justify")
-    text = re.sub(r'text-align: justify; text-align: justify', 'text-align: justify', text)
-    text = re.sub(r'(text-align: justify; )+', 'text-align: justify; ', text)
-    text = re.sub(r'(font-size: [^;]+; )+', lambda m: m.group(0).split('; ')[0] + '; ', text)
+    text = text.replace('text-align: justify; text-align: justify', 'text-align: justify')
+    text = _JUSTIFY_RUN_RE.sub('text-align: justify; ', text)
+    text = _FONT_SIZE_RUN_RE.sub(lambda m: m.group(0).split('; ')[0] + '; ', text)
     
     # Remove excessive style attributes from every div
-    text = re.sub(r'<div style="text-align: justify"><b>', '<div>', text)
-    text = re.sub(r'<div style="text-align: justify">', '<div>', text)
+    text = _JUSTIFIED_DIV_RE.sub('<div>', text)
     
     # Fix the specific payment table spacing issue - remove break between Number of Payments Due and Net Payment Amount
     # Simple approach: remove <br> between these two specific divs
-    text = re.sub(r'Number of Payments Due:</u></b> \{[M590]\}</div>\s*<br>\s*<div><b><u>Net Payment Amount:', 
-                  'Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:', 
-                  text)
+    text = _PAYMENTS_DUE_BREAK_RE.sub('Number of Payments Due:</u></b> {[M590]}</div>\n<div><b><u>Net Payment Amount:', text)
     
     # Remove excessive <b> tags that wrap every line
-    text = re.sub(r'<b>(\{[^}]+\})</b>', r'\1', text)
+    text = _BOLD_FIELD_RE.sub(r'\1', text)
     
     # Clean up broken HTML tags
-    text = re.sub(r'</b><b>', '', text)  # Remove broken </b><b> sequences
-    text = re.sub(r'<b></b>', '', text)  # Remove empty bold tags
-    text = re.sub(r'<b>\s*</b>', '', text)  # Remove bold tags with only whitespace
+    text = text.replace('</b><b>', '')  # Remove broken </b><b> sequences
+    text = text.replace('<b></b>', '')  # Remove empty bold tags
+    text = _EMPTY_B_RE.sub('', text)  # Remove bold tags with only whitespace
     
     # Fix orphaned </b> tags without opening <b>
-    text = re.sub(r'(\{[^}]+\})\s*</b>', r'\1', text)  # Remove </b> after field names
-    text = re.sub(r'([^<])\s*</b>', r'\1', text)  # Remove orphaned </b> tags
+    text = _FIELD_BOLD_CLOSE_RE.sub(r'\1', text)  # Remove </b> after field names
+    text = _ORPHAN_BOLD_CLOSE_RE.sub(r'\1', text)  # Remove orphaned </b> tags
     
     # Fix broken <b></div> patterns
-    text = re.sub(r'<b></div>', '</div>', text)
+    text = text.replace('<b></div>', '</div>')
     
     # Fix missing closing </b> tags
-    text = re.sub(r'<b>([^<]+)</div>', r'<b>\1</b></div>', text)
+    text = _UNCLOSED_BOLD_RE.sub(r'<b>\1</b></div>', text)
     
     # Clean up malformed field names
-    text = re.sub(r'\{</b><b>([^}]+)</b><b>\}', r'{\[\1\]}', text)  # Fix broken field names
+    text = _SPLIT_FIELD_RE.sub(r'{\[\1\]}', text)  # Fix broken field names
     
     # Clean up empty divs
-    text = re.sub(r'<div><b></b></div>', '', text)
-    text = re.sub(r'<div style="text-align: justify"></div>', '', text)
-    text = re.sub(r'<div></div>', '', text)
+    text = text.replace('<div><b></b></div>', '')
+    text = text.replace('<div style="text-align: justify"></div>', '')
+    text = text.replace('<div></div>', '')
     
     # Remove duplicate payment information that appears after the table
-    duplicate_pattern = r'<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b><b> </b></div>.*?<div><u><b>Unapplied/Suspense Funds: </b></u><b>\$</b><b>\{Money\} </b></div>'
-    text = re.sub(duplicate_pattern, '', text, flags=re.DOTALL)
+    text = _remove_duplicate_payment_info(text)
     
     return text
 
+# Spacing and comment patterns used by clean_and_format_html
+_ADJACENT_DIVS_RE = re.compile(r'</div>\s*<div>')
+_PARENTHETICAL_RE = re.compile(r'\([^)]*\)\s*')
+
 def clean_and_format_html(text):
     """Clean up and add proper spacing"""
     # Remove duplicate payment information that appears after the table
     # Look for the pattern where payment info is repeated as individual lines
-    duplicate_pattern = r'<div><u><b>Number of Payments Due:</b></u><u><b> </b></u><b>{[M590]}</b><b> </b></div>.*?<div><u><b>Unapplied/Suspense Funds: </b></u><b>\$</b><b>\{Money\} </b></div>'
-    text = re.sub(duplicate_pattern, '', text, flags=re.DOTALL)
+    text = _remove_duplicate_payment_info(text)
     
     # Add <br> between divs for proper spacing
-    text = re.sub(r'</div>\s*<div>', '</div>\n<br>\n<div>', text)
-    
-    # Clean up multiple line breaks
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _ADJACENT_DIVS_RE.sub('</div>\n<br>\n<div>', text)
     
-    # Remove excessive whitespace and comments
-    text = re.sub(r'\([^)]*\)\s*', '', text)  # Remove comments in parentheses
-    text = re.sub(r'\s+', ' ', text)  # Collapse multiple spaces
-    text = re.sub(r' \n', '\n', text)  # Remove spaces before newlines
+    # Remove excessive whitespace and comments; every newline run collapses to a space
+    # here, so the line-break cleanups this used to do first and last had no effect
+    text = _PARENTHETICAL_RE.sub('', text)  # Remove comments in parentheses
+    text = _collapse_whitespace(text)  # Collapse multiple spaces
     
     return text
@@ -179,64 +179,42 @@ class WordFormatter {
     static async extractTextFromWord(file) {
         console.log('extractTextFromWord called with:', file.name, 'Size:', file.size);
         
-        return new Promise((resolve, reject) => {
-            const reader = new FileReader();
+        try {
+            // Call Vercel Python serverless function with the raw file as the body
+            const response = await fetch('/api/process-word.py', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+                    'X-File-Name': encodeURIComponent(file.name)
+                },
+                body: file
+            });
             
-            reader.onload = async function(event) {
-                console.log('FileReader onload triggered');
-                const dataURL = event.target.result;
-                console.log('DataURL length:', dataURL.length);
-                
-                try {
-                    // Extract base64 string from data URL
-                    const base64String = dataURL.split(',')[1];
-                    
-                    // Call Vercel Python serverless function
-                    const response = await fetch('/api/process-word.py', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            fileData: base64String,
-                            fileName: file.name
-                        })
-                    });
-                    
-                    if (!response.ok) {
-                        throw new Error(`HTTP error! status: ${response.status}`);
-                    }
-                    
-                    const result = await response.json();
-                    console.log('Python processing result:', result);
-                    
-                    if (result.success) {
-                        resolve(result.formattedHtml);
-                    } else {
-                        const errorMsg = result.error || 'Unknown error';
-                        console.error('Python processing error:', errorMsg);
-                        resolve(`<div style="color: red; padding: 20px; border: 1px solid red; border-radius: 4px;">
-                            <h3>Error Processing Document:</h3>
-                            <p>${errorMsg}</p>
-                        </div>`);
-                    }
-                    
-                } catch (error) {
-                    console.error('Error calling Python function:', error);
-                    resolve(`<div style="color: red; padding: 20px; border: 1px solid red; border-radius: 4px;">
-                        <h3>Error Processing Document:</h3>
-                        <p>Failed to process document: ${error.message}</p>
-                    </div>`);
-                }
-            };
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
             
-            reader.onerror = function() {
-                console.error('FileReader error occurred');
-                reject(new Error('Failed to read file'));
-            };
+            const result = await response.json();
+            console.log('Python processing result:', result);
             
-            reader.readAsDataURL(file);
-        });
+            if (result.success) {
+                return result.formattedHtml;
+            }
+            
+            const errorMsg = result.error || 'Unknown error';
+            console.error('Python processing error:', errorMsg);
+            return `<div style="color: red; padding: 20px; border: 1px solid red; border-radius: 4px;">
+                <h3>Error Processing Document:</h3>
+                <p>${errorMsg}</p>
+            </div>`;
+            
+        } catch (error) {
+            console.error('Error calling Python function:', error);
+            return `<div style="color: red; padding: 20px; border: 1px solid red; border-radius: 4px;">
+                <h3>Error Processing Document:</h3>
+                <p>Failed to process document: ${error.message}</p>
+            </div>`;
+        }
     }
 }
 
@@ -0,0 +1,116 @@
+"""Golden and regression tests for api/process-word.py"""
+
+import base64
+import glob
+import importlib.util
+import json
+import os
+import threading
+import unittest
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOLDEN_DIR = os.path.join(ROOT, 'tests', 'golden')
+
+# The handler module's file name has a hyphen, so it is loaded by path
+_spec = importlib.util.spec_from_file_location('process_word', os.path.join(ROOT, 'api', 'process-word.py'))
+process_word = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(process_word)
+
+def sample_documents():
+    """Every sample .docx in the repository, in a stable order"""
+    
+    return sorted(glob.glob(os.path.join(ROOT, '**', '*.docx'), recursive=True))
+
+@unittest.skipUnless(process_word.DOCX_AVAILABLE, 'python-docx is not installed')
+class GoldenDocumentTests(unittest.TestCase):
+    def test_sample_documents_match_golden_html(self):
+        """Each sample document renders exactly the committed expected HTML"""
+        
+        documents = sample_documents()
+        self.assertTrue(documents)
+        for path in documents:
+            name = os.path.splitext(os.path.basename(path))[0]
+            with self.subTest(document=name):
+                with open(path, 'rb') as f:
+                    result = process_word.process_word_document(f.read(), os.path.basename(path))
+                self.assertTrue(result['success'], result.get('error'))
+                with open(os.path.join(GOLDEN_DIR, name + '.html'), encoding='utf-8', newline='') as f:
+                    expected = f.read()
+                self.assertEqual(result['formattedHtml'], expected)
+
+@unittest.skipUnless(process_word.DOCX_AVAILABLE, 'python-docx is not installed')
+class TransformToTargetFormatTests(unittest.TestCase):
+    def test_re_table_keeps_both_breaks_before_salutation(self):
+        """Normalization after every payment entry decides the '</div>' run and the <br> cleanup"""
+        
+        text = process_word._RE_TABLE + '\n<br>\n<br>\n<div>Dear {[Salutation]},</div>\n'
+        expected = (
+            process_word._RE_TABLE + '</div>' * 7
+            + '\n<br>\n<br>\n<div>Dear {[Salutation]},</div> '
+        )
+        self.assertEqual(process_word.transform_to_target_format(text), expected)
+
+class DecodeFileDataTests(unittest.TestCase):
+    def test_line_wrapped_base64_longer_than_one_chunk(self):
+        """Wrapped base64 decodes like b64decode even when lines straddle chunk boundaries"""
+        
+        data = os.urandom(process_word._DECODE_CHUNK_SIZE * 2 + 1001)
+        for newline in ('\n', '\r\n'):
+            with self.subTest(newline=repr(newline)):
+                encoded = base64.encodebytes(data).decode('ascii').replace('\n', newline)
+                self.assertGreater(len(encoded), process_word._DECODE_CHUNK_SIZE)
+                with process_word.decode_file_data(encoded) as file_stream:
+                    self.assertEqual(file_stream.read(), data)
+
+@unittest.skipUnless(process_word.DOCX_AVAILABLE, 'python-docx is not installed')
+class HandlerTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), process_word.handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        with open(sample_documents()[0], 'rb') as f:
+            self.document = f.read()
+    
+    def post_raw_upload(self, path):
+        """POST the sample document as a raw .docx body and decode the JSON reply"""
+        
+        request = urllib.request.Request(
+            f'http://127.0.0.1:{self.server.server_port}{path}',
+            data=self.document,
+            headers={'Content-Type': process_word._DOCX_CONTENT_TYPE},
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())
+    
+    def test_bare_debug_query_flag_returns_extracted_structure(self):
+        """'?debug' without a value turns debugging on, like '?debug=1'"""
+        
+        for path in ('/api?debug', '/api?debug=1'):
+            with self.subTest(path=path):
+                result = self.post_raw_upload(path)
+                self.assertTrue(result['success'])
+                self.assertIn('paragraphs', result)
+                self.assertIn('tables', result)
+    
+    def test_no_debug_query_omits_extracted_structure(self):
+        """Without the flag only the formatted HTML and document type come back"""
+        
+        result = self.post_raw_upload('/api')
+        self.assertTrue(result['success'])
+        self.assertNotIn('paragraphs', result)
+
+class DeploymentCopyTests(unittest.TestCase):
+    def test_netlify_handler_matches_api_handler(self):
+        """The Netlify function is a verbatim copy of the Vercel handler"""
+        
+        with open(os.path.join(ROOT, 'api', 'process-word.py'), 'rb') as f:
+            api_source = f.read()
+        with open(os.path.join(ROOT, 'netlify', 'functions', 'process-word.py'), 'rb') as f:
+            netlify_source = f.read()
+        self.assertEqual(api_source, netlify_source)
+
+if __name__ == '__main__':
+    unittest.main()